@@ -3,6 +3,7 @@
 Usage:
     python -m benchmarks generate [--sizes 50,100,1000,5000] [--seed 42]
     python -m benchmarks compression
+    python -m benchmarks speed [--repeat 5]
     python -m benchmarks llm --model MODEL [--endpoint URL] [--data FILE] [--queries N]
     python -m benchmarks report [--include-all]
     python -m benchmarks full-report [--output-dir PATH]
@@ -41,6 +42,10 @@ def main() -> int:
     comp_parser = subparsers.add_parser("compression", help="Run compression benchmarks")
     comp_parser.add_argument("--no-readme", action="store_true", help="Skip README update")
 
+    # Speed command
+    speed_parser = subparsers.add_parser("speed", help="Time interpreted vs codegen encoding")
+    speed_parser.add_argument("--repeat", type=int, default=5, help="Measurements per fixture (default: 5)")
+
     # LLM command
     llm_parser = subparsers.add_parser("llm", help="Run LLM accuracy benchmarks")
     llm_parser.add_argument("--model", required=True, help="Model name (e.g., qwen2.5:7b)")
@@ -85,6 +90,8 @@ def main() -> int:
         return cmd_generate(args)
     elif args.command == "compression":
         return cmd_compression(args)
+    elif args.command == "speed":
+        return cmd_speed(args)
     elif args.command == "llm":
         return asyncio.run(cmd_llm(args))
     elif args.command == "report":
@@ -179,6 +186,25 @@ def cmd_compression(args: argparse.Namespace) -> int:
     return 0
 
 
+def cmd_speed(args: argparse.Namespace) -> int:
+    """Run encoding speed benchmarks."""
+    from benchmarks.core.fixtures import load_fixtures
+    from benchmarks.runners.speed import SpeedBenchmark, generate_speed_markdown
+
+    print("=" * 60)
+    print("Speed Benchmarks (interpreted vs codegen)")
+    print("=" * 60)
+    print()
+
+    fixtures = load_fixtures()
+    print(f"Loaded {len(fixtures)} fixtures\n")
+
+    results = SpeedBenchmark(repeat=args.repeat).run(fixtures)
+    print()
+    print(generate_speed_markdown(results))
+    return 0
+
+
 async def cmd_llm(args: argparse.Namespace) -> int:
     """Run LLM accuracy benchmarks."""
     from benchmarks.runners.llm_accuracy import run_benchmark
@@ -0,0 +1,74 @@
+"""Encoding speed benchmark: interpreter-style formatters vs generated code."""
+
+from __future__ import annotations
+
+import timeit
+from dataclasses import dataclass
+
+from minemizer import Encoder
+from minemizer.config import Config
+
+
+@dataclass
+class SpeedResult:
+    """Timings for a single fixture, in microseconds per encode() call."""
+
+    fixture_name: str
+    rows: int
+    interpreted_us: float
+    codegen_us: float
+
+    @property
+    def speedup(self) -> float:
+        return self.interpreted_us / self.codegen_us
+
+
+def _time_encoders(encoders: list[Encoder], data: list[dict], repeat: int) -> list[float]:
+    """Best-of-repeat time of one encode() call per encoder, in microseconds.
+
+    Measurements alternate between the encoders so that machine noise hits all of them alike.
+    """
+    timers = [timeit.Timer(lambda enc=enc: enc.encode(data)) for enc in encoders]
+    number, _ = timers[0].autorange()  # Enough calls for about 0.2s per measurement
+    best = [float("inf")] * len(timers)
+    for _ in range(repeat):
+        for i, timer in enumerate(timers):
+            best[i] = min(best[i], timer.timeit(number))
+    return [t / number * 1e6 for t in best]
+
+
+class SpeedBenchmark:
+    """Times Encoder.encode() with and without Config.codegen on every fixture."""
+
+    def __init__(self, preset: Config | None = None, repeat: int = 5, verbose: bool = True):
+        self.preset = preset
+        self.repeat = repeat
+        self.verbose = verbose
+
+    def run(self, fixtures: dict[str, list[dict]]) -> list[SpeedResult]:
+        results = []
+        for name, data in fixtures.items():
+            interpreted = Encoder(data, preset=self.preset)
+            compiled = Encoder(data, preset=self.preset, codegen=True)
+            if compiled.encode(data) != interpreted.encode(data):
+                raise AssertionError(f"codegen output differs on {name}")
+
+            interpreted_us, codegen_us = _time_encoders([interpreted, compiled], data, self.repeat)
+            result = SpeedResult(name, len(data), interpreted_us, codegen_us)
+            results.append(result)
+            if self.verbose:
+                print(f"  {name}: {result.speedup:.2f}x")
+        return results
+
+
+def generate_speed_markdown(results: list[SpeedResult]) -> str:
+    """Render speed results as a markdown table."""
+    lines = [
+        "| Fixture | Rows | Interpreted (µs) | Codegen (µs) | Speedup |",
+        "|---|---|---|---|---|",
+    ]
+    for r in results:
+        lines.append(
+            f"| {r.fixture_name} | {r.rows} | {r.interpreted_us:,.1f} | {r.codegen_us:,.1f} | {r.speedup:.2f}x |"
+        )
+    return "\n".join(lines)
@@ -4,8 +4,41 @@
 
 """Minemizer - Minimize your stuff."""
 
-from minemizer.config import config, presets
-from minemizer.core import minemize
+from minemizer.aio import aiter_minemize, aminemize
+from minemizer.columnar import Columns
+from minemizer.config import config, presets, using
+from minemizer.core import (
+    Encoder,
+    IncrementalEncoder,
+    ParallelEncoder,
+    iter_minemize,
+    minemize,
+    minemize_chunks,
+    minemize_records,
+    minemize_to,
+)
+from minemizer.decoder import iter_unminemize, unminemize
+from minemizer.rowindex import RowIndex
+from minemizer.schema import Schema
 
 __version__ = "0.1.0"
-__all__ = ["minemize", "config", "presets"]
+__all__ = [
+    "minemize",
+    "minemize_to",
+    "iter_minemize",
+    "minemize_chunks",
+    "minemize_records",
+    "aminemize",
+    "aiter_minemize",
+    "unminemize",
+    "iter_unminemize",
+    "Encoder",
+    "ParallelEncoder",
+    "IncrementalEncoder",
+    "Columns",
+    "RowIndex",
+    "Schema",
+    "config",
+    "presets",
+    "using",
+]
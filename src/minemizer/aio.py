@@ -0,0 +1,169 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+"""asyncio counterparts of minemize() and iter_minemize()."""
+
+import asyncio
+import os
+from collections import deque
+from collections.abc import AsyncIterable, AsyncIterator, Iterable
+from concurrent.futures import Executor
+from typing import Any
+
+from minemizer.columnar import Columns
+from minemizer.config import AnyConfig, FrozenConfig
+from minemizer.core import (
+    _STREAM_SCHEMA_ROWS,
+    Encoder,
+    HeaderElement,
+    _finish_line,
+    _iter_chunks,
+    _resolve_config,
+    _stream_source,
+)
+
+_Chunks = Iterable[list[dict] | Columns] | AsyncIterable[list[dict]]
+
+
+def _format_lines(encoder: Encoder, rows: list[dict] | Columns) -> list[str]:
+    """Unfinished output lines for one chunk of rows (runs in the executor)."""
+    return list(encoder._iter_lines(rows))
+
+
+async def _achunks(rows: AsyncIterator[dict], first: list[dict], size: int) -> AsyncIterator[list[dict]]:
+    """Yield first, then rows from an async iterator, in chunks of size rows."""
+    for start in range(0, len(first), size):
+        yield first[start : start + size]
+    chunk: list[dict] = []
+    async for row in rows:
+        chunk.append(row)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+async def _asample(data: AsyncIterable[dict], cfg: FrozenConfig) -> tuple[list[dict], AsyncIterator[dict]]:
+    """Read the rows to infer the header from, returning them and the rest of the stream."""
+    if cfg.schema_sample_mode != "head":
+        raise ValueError(f"schema_sample_mode={cfg.schema_sample_mode!r} needs a list, not an async iterable")
+    rows = aiter(data)
+    limit = cfg.schema_sample or _STREAM_SCHEMA_ROWS
+    sample: list[dict] = []
+    while len(sample) < limit:
+        try:
+            sample.append(await anext(rows))
+        except StopAsyncIteration:
+            break
+    return sample, rows
+
+
+async def _format_chunks(encoder: Encoder, chunks: _Chunks, executor: Executor | None) -> AsyncIterator[list[str]]:
+    """Format chunks (a sync or async iterable) in order, yielding their unfinished lines."""
+    loop = asyncio.get_running_loop()
+    pending: deque[asyncio.Future[list[str]]] = deque()
+    limit = 2 * (os.cpu_count() or 1)  # Chunks in flight in the executor
+
+    async def drain(until: int) -> AsyncIterator[list[str]]:
+        while len(pending) > until:
+            yield await pending.popleft()
+
+    iterator = chunks if isinstance(chunks, AsyncIterable) else _as_async(chunks)
+    async for chunk in iterator:
+        if executor is None:
+            yield _format_lines(encoder, chunk)
+            await asyncio.sleep(0)
+            continue
+        pending.append(loop.run_in_executor(executor, _format_lines, encoder, chunk))
+        async for lines in drain(limit):
+            yield lines
+    async for lines in drain(0):
+        yield lines
+
+
+async def _as_async(items: Iterable[Any]) -> AsyncIterator[Any]:
+    for item in items:
+        yield item
+
+
+async def aiter_minemize(
+    data: AsyncIterable[dict] | Iterable[dict] | dict | Columns,
+    *,
+    executor: Executor | None = None,
+    chunk_size: int = 1000,
+    preset: AnyConfig | None = None,
+    schema: Iterable[HeaderElement] | None = None,
+    **overrides: Any,
+) -> AsyncIterator[str]:
+    """Minemize rows from an async (or regular) iterable, yielding output lines.
+
+    Same output as iter_minemize(). Rows are formatted `chunk_size` at a time and
+    control returns to the event loop after every chunk. With an executor, chunks
+    are formatted there instead (a few at a time, in order), so the loop stays free
+    while the next rows are read; a ProcessPoolExecutor also uses other cores.
+
+    Args:
+        data: An async iterable of dicts (e.g. a DB cursor), or anything iter_minemize() accepts
+        executor: Thread or process pool to format chunks in (default: None = in the event loop)
+        chunk_size: Rows formatted between yields to the event loop, or per executor job
+        preset: Pre-configured Config (e.g., presets.markdown, presets.csv)
+        schema: A Schema to format with instead of inferring the header from data
+        **overrides: Any Config field, as accepted by minemize()
+
+    Examples:
+        async for line in aiter_minemize(cursor, executor=pool):
+            await stream.write(line + "\\n")
+    """
+    cfg = _resolve_config(preset, overrides)
+    sample: list[dict] | Columns | None
+    if isinstance(data, AsyncIterable):
+        if schema is None:
+            sample, rest = await _asample(data, cfg)
+            chunks: _Chunks = _achunks(rest, sample, chunk_size)
+        else:
+            sample, chunks = None, _achunks(aiter(data), [], chunk_size)
+    else:
+        sample, rows = _stream_source(data, cfg, schema)
+        chunks = _iter_chunks(rows, chunk_size)
+    encoder = Encoder(sample, schema=schema, preset=cfg)
+
+    strip = encoder._strip
+    interval = cfg.header_repeat_interval
+    previous: str | None = None
+    count = 0
+    async for lines in _format_chunks(encoder, chunks, executor):
+        for line in lines:
+            if previous is None:
+                for header_line in encoder._header_lines:
+                    yield header_line
+            else:
+                yield _finish_line(previous, strip, False)
+                if interval and count % interval == 0:
+                    for header_line in encoder._header_lines:
+                        yield header_line
+            previous = line
+            count += 1
+    if previous is not None:
+        yield _finish_line(previous, strip, True)
+
+
+async def aminemize(
+    data: AsyncIterable[dict] | Iterable[dict] | dict | Columns,
+    *,
+    executor: Executor | None = None,
+    chunk_size: int = 1000,
+    preset: AnyConfig | None = None,
+    schema: Iterable[HeaderElement] | None = None,
+    **overrides: Any,
+) -> str:
+    """Minemize rows from an async (or regular) iterable without blocking the event loop.
+
+    Returns the same text as minemize(); see aiter_minemize() for the arguments.
+
+    Examples:
+        text = await aminemize(cursor, preset=presets.compact)
+    """
+    lines = aiter_minemize(data, executor=executor, chunk_size=chunk_size, preset=preset, schema=schema, **overrides)
+    return "\n".join([line async for line in lines])
@@ -0,0 +1,146 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Compile HeaderElement trees into generated Python formatters (Config.codegen)."""
+
+from collections.abc import Callable
+from typing import Any
+
+from minemizer.core import (
+    HeaderElement,
+    _emit_any,
+    _emit_column,
+    _emit_dict_formatter,
+    _Emitter,
+    _ShapeCache,
+    _Unsafe,
+)
+
+
+class _Compiler:
+    """Generate one module of source for a top-level header column.
+
+    Every dict schema (a dict column or the items of a list-of-dicts column) becomes
+    a function with its child keys, delimiter and braces bound as constants and the
+    `_Emitter.join()` spacing rules unrolled per child. Names in the schema never
+    appear in the source: keys are referenced through the namespace.
+    """
+
+    def __init__(self, e: _Emitter):
+        self.e = e
+        self.lines: list[str] = []
+        self.namespace: dict[str, Any] = {
+            "D": e.delimiter,
+            "NO_GAP": ("{", "[", ":", *e.trueish),
+            "Unsafe": _Unsafe,
+            "scalar": e.scalar,
+            "kv": e.kv,
+            "join": e.join,
+            "emit_any": lambda value: _emit_any(value, e),
+        }
+        self.count = 0
+
+    def constant(self, value: Any) -> str:
+        name = f"c{len(self.namespace)}"
+        self.namespace[name] = value
+        return name
+
+    def dict_function(self, element: HeaderElement) -> str:
+        """Emit a function formatting a non-None dict against element's schema; return its name."""
+        name = f"d{self.count}"
+        self.count += 1
+        if not element.schema:
+            # Only sparse keys: the first part is a `key: value` pair, keep the runtime join
+            self.namespace[name] = _emit_dict_formatter(element, self.e)
+            return name
+
+        body = ["    if not data:", '        return "{}"']
+        for i, child in enumerate(element.schema):
+            body.extend(self.child(child, f"a{i}", first=i == 0))
+        parts = " + D + ".join(f"a{i}" for i in range(len(element.schema)))
+        body.append(f'    out = "{{" + {parts}')
+        if element.has_sparse:
+            shapes = self.constant(_ShapeCache(element.schema_keys))
+            body += [
+                f"    keys, positions = {shapes}.sparse(data)",
+                "    for i in positions:",
+                "        k = keys[i]",
+                "        t = kv(k, emit_any(data[k]))",
+                '        out += D + (t if not t or t.startswith(NO_GAP) else " " + t)',
+            ]
+        body.append('    return out + "}"')
+        self.lines += [f"def {name}(data):", *body, ""]
+        return name
+
+    def child(self, element: HeaderElement, var: str, first: bool) -> list[str]:
+        """Statements assigning the spaced text of one child to var."""
+        key = self.constant(element.name)
+        code = [f"    v = data.get({key})", "    if v is None:", f'        {var} = ""']
+        if element.kind == HeaderElement.VALUE:
+            # Numbers never start with an opener or true/false/null
+            code += ["    elif type(v) is int or type(v) is float:", f'        {var} = " " + str(v)']
+            branches = [("else:", "scalar(v)")]
+        elif element.kind == HeaderElement.DICT:
+            fn = self.dict_function(element)
+            branches = [("elif isinstance(v, dict):", f"{fn}(v)"), ("else:", "emit_any(v)")]
+        elif element.kind == HeaderElement.DICT_LIST:
+            fn = self.dict_function(element)
+            items = f'join([{fn}(x) if isinstance(x, dict) else emit_any(x) for x in v], "[", "]")'
+            branches = [("elif isinstance(v, list) and v:", items), ("else:", "emit_any(v)")]
+        else:
+            branches = [("else:", "emit_any(v)")]
+
+        for branch, text in branches:
+            code += [f"    {branch}", f"        t = {text}", *self.spaced(var, first)]
+        return code
+
+    @staticmethod
+    def spaced(var: str, first: bool) -> list[str]:
+        """Unrolled `_Emitter.join()` rules for the part in `t`."""
+        if not first:
+            return [f'        {var} = t if not t or t.startswith(NO_GAP) else " " + t']
+        # First part after "{": no true/false/null rule, and "{{" is left to the reference path
+        return [
+            "        if not t:",
+            f'            {var} = ""',
+            '        elif t[0] in "{[:":',
+            '            if t[:2] == "{{":',
+            "                raise Unsafe",
+            f"            {var} = t",
+            "        else:",
+            f'            {var} = " " + t',
+        ]
+
+
+def compile_column(element: HeaderElement, e: _Emitter) -> Callable[[Any], str]:
+    """Compile the emitter for one top-level header column into generated source.
+
+    Returns a drop-in replacement for `_emit_column(element, e)`. Value and simple
+    list columns have nothing to unroll and keep the closure.
+    """
+    if element.kind in (HeaderElement.VALUE, HeaderElement.LIST):
+        return _emit_column(element, e)
+
+    compiler = _Compiler(e)
+    fn = compiler.dict_function(element)
+    if element.kind == HeaderElement.DICT:
+        column = [
+            "def column(value):",
+            "    if isinstance(value, dict):",
+            f"        return {fn}(value)",
+            "    return emit_any(value)",
+        ]
+    else:
+        column = [
+            "def column(value):",
+            "    if not isinstance(value, list) or not value:",
+            "        return emit_any(value)",
+            f'    return join([{fn}(x) if isinstance(x, dict) else emit_any(x) for x in value], "[", "]")',
+        ]
+    source = "\n".join([*compiler.lines, *column, ""])
+    namespace = compiler.namespace
+    exec(compile(source, f"<minemizer codegen: {element.name}>", "exec"), namespace)
+    column_fn = namespace["column"]
+    column_fn.__source__ = source
+    return column_fn
@@ -0,0 +1,102 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Column-oriented inputs: dict of lists, NumPy structured arrays, pyarrow Tables."""
+
+from collections.abc import Mapping, Sequence
+from typing import Any
+
+
+class Columns:
+    """Column-oriented data that minemizes like the equivalent list of row dicts.
+
+    Row `i` is `{name: column[i] for name in names}`, but no row dicts are built:
+    the header is inferred per column and rows are assembled from column iterators.
+    NumPy structured arrays and pyarrow Tables/RecordBatches are detected by
+    minemize() automatically; a dict of lists must be wrapped explicitly, since a
+    plain dict is a single row.
+
+    Args:
+        data: A mapping of column name to equal-length sequence, a NumPy structured
+            array, or a pyarrow Table or RecordBatch
+
+    Examples:
+        minemize(Columns({"id": [1, 2], "name": ["Alice", "Bob"]}))
+        minemize(np.array(rows, dtype=[("id", "i8"), ("score", "f8")]))
+    """
+
+    __slots__ = ("names", "_data", "_kind", "_len")
+
+    names: tuple[str, ...]
+    _data: Any  # dict of lists, NumPy structured array or pyarrow Table/RecordBatch
+    _kind: str
+    _len: int
+
+    def __init__(self, data: Any):
+        if isinstance(data, Columns):
+            self.names, self._data, self._kind, self._len = data.names, data._data, data._kind, data._len
+        elif _is_numpy_records(data):
+            self.names, self._data, self._kind, self._len = tuple(data.dtype.names), data, "numpy", len(data)
+        elif _is_arrow_table(data):
+            self.names, self._data, self._kind, self._len = tuple(data.column_names), data, "arrow", data.num_rows
+        elif isinstance(data, Mapping):
+            lengths = {len(column) for column in data.values()}
+            if len(lengths) > 1:
+                raise ValueError(f"Columns must have equal lengths, got {sorted(lengths)}")
+            self.names, self._data, self._kind = tuple(data), dict(data), "mapping"
+            self._len = lengths.pop() if lengths else 0
+        else:
+            raise TypeError(f"Unsupported columnar input: {type(data).__name__}")
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __repr__(self) -> str:
+        return f"Columns({list(self.names)!r}, rows={self._len})"
+
+    def column(self, name: str, start: int = 0, stop: int | None = None) -> list:
+        """Return the Python values of one column between start and stop."""
+        stop = self._len if stop is None else min(stop, self._len)
+        if self._kind == "numpy":
+            return self._data[name][start:stop].tolist()
+        if self._kind == "arrow":
+            return self._data.column(name).slice(start, max(stop - start, 0)).to_pylist()
+        return list(self._data[name][start:stop])
+
+    def take(self, name: str, indices: Sequence[int]) -> list:
+        """Return the Python values of one column at the given row indices."""
+        if isinstance(indices, range) and indices.step == 1:
+            return self.column(name, indices.start, indices.stop)
+        if self._kind == "numpy":
+            return self._data[name][list(indices)].tolist()
+        if self._kind == "arrow":
+            return self._data.column(name).take(list(indices)).to_pylist()
+        column = self._data[name]
+        return [column[i] for i in indices]
+
+    def slice(self, start: int, stop: int) -> "Columns":
+        """Return rows start:stop as Columns (a view for NumPy and pyarrow inputs)."""
+        stop = min(stop, self._len)
+        if self._kind == "numpy":
+            return Columns(self._data[start:stop])
+        if self._kind == "arrow":
+            return Columns(self._data.slice(start, max(stop - start, 0)))
+        return Columns({name: self._data[name][start:stop] for name in self.names})
+
+
+def _is_numpy_records(data: Any) -> bool:
+    return bool(getattr(getattr(data, "dtype", None), "names", None)) and hasattr(data, "tolist")
+
+
+def _is_arrow_table(data: Any) -> bool:
+    return hasattr(data, "column_names") and hasattr(data, "num_rows")
+
+
+def _as_columns(data: Any) -> Columns | None:
+    """Return data as Columns if it is a columnar input, else None."""
+    if isinstance(data, Columns):
+        return data
+    if _is_numpy_records(data) or _is_arrow_table(data):
+        return Columns(data)
+    return None
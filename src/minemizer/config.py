@@ -4,12 +4,46 @@
 
 """Global configuration for minemizer."""
 
-from dataclasses import dataclass, replace
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field, fields, replace
 from typing import Any
 
 # Sentinel for "not provided" (distinct from None)
 _NOT_PROVIDED: Any = object()
 
+# Frozen forms of recently seen configs, keyed by their field values
+_FROZEN_CACHE_SIZE = 64
+_frozen_cache: dict[tuple, "FrozenConfig"] = {}
+
+
+def _cleanup_table(c: "AnyConfig") -> tuple[tuple[str, str], ...]:
+    """The ordered (old, new) str.replace passes of Config.cleanup()."""
+    d = c.spaced_delimiter
+    kv = c.spaced_kv_separator
+    table: list[tuple[str, str]] = []
+
+    # Token optimizations: ": true" → ":true" etc (single tokens in most tokenizers)
+    if c.common_optimizations:
+        for val in ["true", "false", "null"]:
+            table.append((f"{kv}{val}", f":{val}"))
+            table.append((f"{d}{val}", f"{d.rstrip()}{val}"))
+
+    all_stuff = [d, c.delimiter, kv, c.dict_open, c.list_open, c.dict_close, c.list_close]
+    # Fix: "; ;" → ";;" and "; {" → ";{" and "; [" → ";[" and "[ ;" → "[;" etc"
+    for stuff_a in all_stuff:
+        stuff_a_stripped = stuff_a.strip()
+        for stuff_b in all_stuff:
+            stuff_b_stripped = stuff_b.strip()
+            # May be dumb, but it works.
+            table.append((f"{stuff_a_stripped}  {stuff_b_stripped}", f"{stuff_a_stripped} {stuff_b_stripped}"))
+            table.append((f"{stuff_a_stripped} {stuff_b_stripped}", f"{stuff_a_stripped}{stuff_b_stripped}"))
+
+    table.append((" \n", "\n"))
+    table.append((" \n", "\n"))
+    return tuple(table)
+
 
 @dataclass
 class Config:
@@ -34,6 +68,10 @@ class Config:
     strip_trailing_delimiter: bool = True  # Strip trailing delimiter before newlines (disable for markdown)
     row_prefix: str | None = None  # Prefix before each data row (e.g., "- ")
     schema_prefix: str | None = None  # Prefix before header/schema lines (e.g., "> ")
+    schema_sample: int | None = None  # Infer the header from at most N rows (None = all rows)
+    schema_sample_mode: str = "head"  # How rows are sampled: "head", "stride" or "reservoir"
+    codegen: bool = False  # Compile nested column formatters into generated source (same output)
+    schema_cache: bool = False  # Reuse headers of structurally identical inputs (see core.schema_cache)
 
     @property
     def spaced_delimiter(self) -> str:
@@ -68,31 +106,8 @@ class Config:
         if not self.use_spaces:
             return text
 
-        d = self.spaced_delimiter
-        d_non_spaced = self.delimiter
-        kv = self.spaced_kv_separator
-        openers = [self.dict_open, self.list_open]
-        closers = [self.dict_close, self.list_close]
-
-        # Token optimizations: ": true" → ":true" etc (single tokens in most tokenizers)
-        if self.common_optimizations:
-            for val in ["true", "false", "null"]:
-                text = text.replace(f"{kv}{val}", f":{val}")
-                text = text.replace(f"{d}{val}", f"{d.rstrip()}{val}")
-
-        all_stuff = [d, d_non_spaced, kv] + openers + closers
-        # Fix: "; ;" → ";;" and "; {" → ";{" and "; [" → ";[" and "[ ;" → "[;" etc"
-        for stuff_a in all_stuff:
-            stuff_a_stripped = stuff_a.strip()
-            for stuff_b in all_stuff:
-                stuff_b_stripped = stuff_b.strip()
-                # May be dumb, but it works.
-                text = text.replace(f"{stuff_a_stripped}  {stuff_b_stripped}", f"{stuff_a_stripped} {stuff_b_stripped}")
-                text = text.replace(f"{stuff_a_stripped} {stuff_b_stripped}", f"{stuff_a_stripped}{stuff_b_stripped}")
-
-        text = text.replace(" \n", "\n")
-        text = text.replace(" \n", "\n")
-
+        for old, new in _cleanup_table(self):
+            text = text.replace(old, new)
         return text
 
     def derive(self, **overrides) -> "Config":
@@ -103,6 +118,98 @@ class Config:
         filtered = {k: v for k, v in overrides.items() if v is not _NOT_PROVIDED}
         return replace(self, **filtered) if filtered else self
 
+    def freeze(self) -> "FrozenConfig":
+        """Return an immutable, hashable snapshot with all derived strings precomputed.
+
+        Later changes to this Config do not affect the snapshot. Equal configs
+        freeze to equal (and usually identical) FrozenConfigs, so they work as
+        cache keys.
+        """
+        key = tuple(getattr(self, f.name) for f in fields(self))
+        frozen = _frozen_cache.get(key)
+        if frozen is None:
+            if len(_frozen_cache) >= _FROZEN_CACHE_SIZE:
+                _frozen_cache.clear()
+            frozen = _frozen_cache[key] = FrozenConfig(*key)
+        return frozen
+
+
+@dataclass(frozen=True, slots=True)
+class FrozenConfig:
+    """Immutable, slotted form of Config, created by `Config.freeze()`.
+
+    Has the same fields, but the delimiter strings, brackets and cleanup() tables
+    are computed once and stored as plain attributes instead of being rebuilt on
+    every access. Hashable, so it can be used as a cache key. This is what the
+    core formats with.
+    """
+
+    # Same fields and order as Config; no defaults, so Config stays their one source
+    delimiter: str
+    use_spaces: bool
+    sparsity_threshold: float
+    sparse_indicator: str
+    header_separator: str | None
+    wrap_lines: str | None
+    common_optimizations: bool
+    header_repeat_interval: int | None
+    strip_trailing_delimiter: bool
+    row_prefix: str | None
+    schema_prefix: str | None
+    schema_sample: int | None
+    schema_sample_mode: str
+    codegen: bool
+    schema_cache: bool
+
+    # Derived strings, precomputed in __post_init__
+    spaced_delimiter: str = field(init=False, repr=False, compare=False)
+    spaced_kv_separator: str = field(init=False, repr=False, compare=False)
+    dict_open: str = field(init=False, repr=False, compare=False)
+    list_open: str = field(init=False, repr=False, compare=False)
+    dict_close: str = field(init=False, repr=False, compare=False)
+    list_close: str = field(init=False, repr=False, compare=False)
+    cleanup_table: tuple[tuple[str, str], ...] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        spaced = self.use_spaces
+        derived = {
+            "spaced_delimiter": f"{self.delimiter} " if spaced else self.delimiter,
+            "spaced_kv_separator": ": " if spaced else ":",
+            "dict_open": "{ " if spaced else "{",
+            "list_open": "[ " if spaced else "[",
+            "dict_close": "}",
+            "list_close": "]",
+        }
+        for name, value in derived.items():
+            object.__setattr__(self, name, value)
+        object.__setattr__(self, "cleanup_table", _cleanup_table(self) if spaced else ())
+
+    def format_kv(self, key: str, value: str) -> str:
+        """Format key-value pair."""
+        return f"{key}{self.spaced_kv_separator}{value}"
+
+    def cleanup(self, text: str) -> str:
+        """Apply all text optimizations."""
+        for old, new in self.cleanup_table:
+            text = text.replace(old, new)
+        return text
+
+    def derive(self, **overrides) -> "FrozenConfig":
+        """Create a new FrozenConfig with overrides applied (see Config.derive)."""
+        filtered = {k: v for k, v in overrides.items() if v is not _NOT_PROVIDED}
+        return replace(self, **filtered) if filtered else self
+
+    def freeze(self) -> "FrozenConfig":
+        return self
+
+    def thaw(self) -> Config:
+        """Return a mutable Config with the same fields."""
+        return Config(**{f.name: getattr(self, f.name) for f in fields(self) if f.init})
+
+
+# Either form of a config; everything that only reads a config accepts both
+AnyConfig = Config | FrozenConfig
+
 
 class presets:  # noqa: N801 - lowercase intentional for API style
     """Pre-configured Config instances for common formats.
@@ -150,3 +257,30 @@ class presets:  # noqa: N801 - lowercase intentional for API style
 
 # Module-level singleton (starts with default preset)
 config = Config()
+
+# Config set by using() in the current thread or asyncio task (None: use `config`)
+_scoped_config: ContextVar["FrozenConfig | None"] = ContextVar("minemizer_config", default=None)
+
+
+@contextmanager
+def using(preset: AnyConfig | None = None, **overrides: Any) -> Iterator[FrozenConfig]:
+    """Make a config the default for minemize() and friends inside a `with` block.
+
+    The preset (default: the enclosing using() config, else the global config) and
+    overrides are frozen once on entry; calls without a preset then use that
+    FrozenConfig as is, with no per-call derivation. Per-call overrides still apply
+    on top, and an explicit preset replaces it. Backed by a ContextVar, so it only
+    affects the current thread or asyncio task (tasks inherit the config active when
+    they are created), unlike changes to the global `config`.
+
+    Examples:
+        with using(presets.compact, sparsity_threshold=0.8):
+            text = minemize(rows)
+    """
+    base = preset if preset is not None else (_scoped_config.get() or config)
+    frozen = base.derive(**overrides).freeze()
+    token = _scoped_config.set(frozen)
+    try:
+        yield frozen
+    finally:
+        _scoped_config.reset(token)
@@ -4,12 +4,42 @@
 
 """Core functionality for minemizer."""
 
-from collections import Counter
+import io
+import os
+import random
+import threading
+from array import array
+from collections import Counter, OrderedDict, deque
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from concurrent.futures import Future, ProcessPoolExecutor
 from dataclasses import dataclass, field
-from typing import Any
+from itertools import chain, islice, repeat
+from operator import itemgetter
+from typing import Any, cast, overload
 
-from minemizer.config import _NOT_PROVIDED, Config
+from minemizer.columnar import Columns, _as_columns
+from minemizer.config import _NOT_PROVIDED, AnyConfig, FrozenConfig, _scoped_config
 from minemizer.config import config as _global_config
+from minemizer.rowindex import RowIndex
+
+# Rows read ahead to infer the header when streaming from a non-list iterable
+_STREAM_SCHEMA_ROWS = 1000
+
+# Distinct key shapes remembered per formatter; rows beyond that are planned one by one
+_SHAPE_CACHE_SIZE = 1024
+
+# Rows formatted together, column by column, by Encoder
+_BLOCK_ROWS = 512
+
+_NONE_TYPE = type(None)
+_DICT_TYPES = frozenset({dict})
+_LIST_TYPES = frozenset({list})
+_NUMBER_TYPES = frozenset({int, float})
+_SCALAR_TYPES = frozenset({int, float, bool, _NONE_TYPE})
+_TEXT_TYPES = frozenset({str, _NONE_TYPE})
+
+# Shared child index of leaf HeaderElements (never mutated)
+_NO_CHILDREN: dict[str, int] = {}
 
 
 @dataclass
@@ -24,37 +54,64 @@ class KeyAnalysis:
         return bool(self.sparse)
 
 
-@dataclass
 class HeaderElement:
-    """Schema definition for a single field in the header."""
+    """Schema definition for a single field in the header.
 
-    name: str
-    cfg: Config
-    type: str = "value"  # "value", "dict", "list"
-    schema: list["HeaderElement"] = field(default_factory=list)
-    has_sparse: bool = False
-    list_type: str | None = None
+    A compact, immutable tree node. Nodes do not hold a Config: the same header can
+    be rendered with any config via `to_string(cfg)`. `schema_keys` (child names)
+    and `index` (child name -> position) are computed once at construction, and
+    pickling stores only the four constructor arguments.
+    """
 
-    @property
-    def schema_keys(self) -> set[str]:
-        """Get the set of key names in the schema."""
-        return {el.name for el in self.schema}
+    __slots__ = ("name", "kind", "schema", "has_sparse", "schema_keys", "index")
+
+    # Kinds
+    VALUE = 0
+    DICT = 1
+    LIST = 2  # A list of scalars or mixed values, formatted without schema
+    DICT_LIST = 3  # A list of dicts sharing `schema`
+
+    def __init__(self, name: str, kind: int = VALUE, schema: Iterable["HeaderElement"] = (), has_sparse: bool = False):
+        self.name = name
+        self.kind = kind
+        self.schema: tuple[HeaderElement, ...] = tuple(schema)
+        self.has_sparse = has_sparse
+        self.schema_keys = frozenset(el.name for el in self.schema)
+        self.index = {el.name: i for i, el in enumerate(self.schema)} if self.schema else _NO_CHILDREN
+
+    def _args(self) -> tuple:
+        return self.name, self.kind, self.schema, self.has_sparse
+
+    def __reduce__(self) -> tuple:
+        return HeaderElement, self._args()
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, HeaderElement):
+            return NotImplemented
+        return self._args() == other._args()
+
+    def __hash__(self) -> int:
+        return hash(self._args())
+
+    def __repr__(self) -> str:
+        return f"HeaderElement({self.name!r}, {self.kind}, {list(self.schema)!r}, {self.has_sparse})"
 
-    def to_string(self) -> str:
-        if self.type == "value":
+    def to_string(self, cfg: AnyConfig) -> str:
+        if self.kind == HeaderElement.VALUE:
             return self.name
 
-        c = self.cfg
-        schema_str = c.spaced_delimiter.join(el.to_string() for el in self.schema)
+        schema_str = cfg.spaced_delimiter.join(el.to_string(cfg) for el in self.schema)
         if self.has_sparse:
-            schema_str = f"{schema_str}{c.spaced_delimiter}{c.sparse_indicator}" if schema_str else c.sparse_indicator
+            schema_str = (
+                f"{schema_str}{cfg.spaced_delimiter}{cfg.sparse_indicator}" if schema_str else cfg.sparse_indicator
+            )
 
-        if self.type == "dict":
-            return f"{self.name}{c.dict_open}{schema_str}{c.dict_close}"
-        elif self.type == "list" and self.list_type == "dict":
-            return f"{self.name}{c.list_open}{c.dict_open}{schema_str}{c.dict_close}{c.list_close}"
+        if self.kind == HeaderElement.DICT:
+            return f"{self.name}{cfg.dict_open}{schema_str}{cfg.dict_close}"
+        elif self.kind == HeaderElement.DICT_LIST:
+            return f"{self.name}{cfg.list_open}{cfg.dict_open}{schema_str}{cfg.dict_close}{cfg.list_close}"
         # Empty simple list
-        return f"{self.name}{c.list_open.rstrip()}{c.list_close}"
+        return f"{self.name}{cfg.list_open.rstrip()}{cfg.list_close}"
 
 
 # --- Pure functions ---
@@ -64,23 +121,7 @@ def _normalize(value: Any) -> str:
     return str(value).lower() if isinstance(value, bool) else str(value)
 
 
-def _majority_type(values: list, threshold: float = 0.5) -> str | None:
-    """Determine the majority type among values. Returns 'dict', 'list', or None."""
-    if not values:
-        return None
-
-    dict_count = sum(1 for v in values if isinstance(v, dict))
-    list_count = sum(1 for v in values if isinstance(v, list))
-    total = len(values)
-
-    if dict_count / total >= threshold:
-        return "dict"
-    if list_count / total >= threshold:
-        return "list"
-    return None
-
-
-def _format_any_value(value: Any, cfg: Config) -> str:
+def _format_any_value(value: Any, cfg: AnyConfig) -> str:
     """Recursively format any value without schema."""
     if value is None:
         return ""
@@ -97,74 +138,323 @@ def _format_any_value(value: Any, cfg: Config) -> str:
     return _normalize(value)
 
 
-def _analyze_keys(items: list[dict], sparsity_threshold: float) -> KeyAnalysis:
-    if not items:
-        return KeyAnalysis()
+# --- Schema statistics ---
+
+
+class _Stats:
+    """Statistics for every value seen at one path of the data tree.
+
+    Collected by `_collect_stats`, one batch of values per path. Dict values feed `fields`
+    (per-key child statistics, with `dicts` as their total) and list values feed
+    `items` (statistics over the flattened list elements).
+    """
 
-    all_keys = list(dict.fromkeys(key for item in items for key in item))
-    counts = Counter(key for item in items for key in item)
-    total = len(items)
+    __slots__ = ("present", "values", "dicts", "lists", "fields", "items")
+
+    def __init__(self) -> None:
+        self.present = 0  # Number of parent dicts containing this key
+        self.values = 0  # Non-None values
+        self.dicts = 0
+        self.lists = 0
+        self.fields: dict[str, _Stats] = {}
+        self.items: _Stats | None = None
+
+    def add_values(self, values: list) -> None:
+        """Count a batch of values seen at this path, in order.
+
+        Dicts are grouped by key tuple and their fields counted a column at a time,
+        so a batch of same-shaped rows costs a few passes per key instead of a
+        Python loop over every key of every row. Field order stays first-seen order:
+        a key is first seen in the first dict of its shape.
+        """
+        types = set(map(type, values))
+        if not any(issubclass(t, (dict, list)) for t in types):
+            self.values += len(values) - (sum(v is None for v in values) if _NONE_TYPE in types else 0)
+            return
+
+        shapes: dict[tuple, list[dict]] = {}
+        dicts = []
+        lists = []
+        for value in values:
+            if isinstance(value, dict):
+                dicts.append(value)
+                shape = tuple(value)
+                group = shapes.get(shape)
+                if group is None:
+                    shapes[shape] = [value]
+                else:
+                    group.append(value)
+            elif isinstance(value, list):
+                lists.append(value)
+            elif value is not None:
+                self.values += 1
+
+        # Keys in first-seen order, with the shape groups that contain them
+        key_groups: dict[Any, list[list[dict]]] = {}
+        for shape, group in shapes.items():
+            for key in shape:
+                key_groups.setdefault(key, []).append(group)
+
+        self.values += len(dicts)
+        self.dicts += len(dicts)
+        fields = self.fields
+        for key, groups in key_groups.items():
+            stats = fields.get(key)
+            if stats is None:
+                stats = fields[key] = _Stats()
+            # Child values must stay in data order: it decides first-seen order below them
+            column = [d[key] for d in groups[0]] if len(groups) == 1 else [d[key] for d in dicts if key in d]
+            stats.present += len(column)
+            stats.add_values(column)
+
+        if lists:
+            self.values += len(lists)
+            self.lists += len(lists)
+            if self.items is None:
+                self.items = _Stats()
+            self.items.add_values([x for value in lists for x in value])
+
+
+def _collect_stats(items: Iterable[dict]) -> _Stats:
+    """Collect statistics for the whole tree, one batch per path."""
+    stats = _Stats()
+    stats.add_values(list(items))
+    return stats
+
+
+def _collect_column_stats(columns: Columns, rows: Sequence[int]) -> _Stats:
+    """Collect the same statistics as `_collect_stats` for the given rows of columnar data."""
+    stats = _Stats()
+    stats.values = stats.dicts = len(rows)
+    for name in columns.names:
+        column = stats.fields[name] = _Stats()
+        column.present = len(rows)
+        column.add_values(columns.take(name, rows))
+    return stats
+
+
+def _majority_type(stats: _Stats, threshold: float = 0.5) -> str | None:
+    """Determine the majority type among values. Returns 'dict', 'list', or None."""
+    if not stats.values:
+        return None
+
+    total = stats.values
+    if stats.dicts / total >= threshold:
+        return "dict"
+    if stats.lists / total >= threshold:
+        return "list"
+    return None
+
+
+def _sample_rows(items: Sequence, cfg: AnyConfig) -> Sequence:
+    """Select the rows used for header inference according to cfg.schema_sample."""
+    n = cfg.schema_sample
+    if n is None or len(items) <= n:
+        return items
 
+    mode = cfg.schema_sample_mode
+    if mode == "head":
+        return items[:n]
+    if mode == "stride":
+        return items[:: -(-len(items) // n)]
+    if mode == "reservoir":
+        # Fixed seed keeps the header stable between runs; sorted to keep key order
+        picked = sorted(random.Random(0).sample(range(len(items)), n))
+        return [items[i] for i in picked]
+    raise ValueError(f"Unknown schema_sample_mode: {mode!r}")
+
+
+def _analyze_keys(stats: _Stats, sparsity_threshold: float) -> KeyAnalysis:
+    """Split the keys of the dicts summarized by `stats` into common and sparse."""
+    if not stats.dicts:
+        return KeyAnalysis()
+
+    total = stats.dicts
     return KeyAnalysis(
-        common=[k for k in all_keys if counts[k] / total >= sparsity_threshold],
-        sparse=[k for k in all_keys if counts[k] / total < sparsity_threshold],
+        common=[k for k, s in stats.fields.items() if s.present / total >= sparsity_threshold],
+        sparse=[k for k, s in stats.fields.items() if s.present / total < sparsity_threshold],
     )
 
 
-def _create_header_element(key: str, items: list[dict], cfg: Config) -> HeaderElement:
-    values = [v for item in items if (v := item.get(key)) is not None]
-
-    if not values:
-        return HeaderElement(name=key, cfg=cfg)
+def _create_header_element(key: str, stats: _Stats, cfg: AnyConfig) -> HeaderElement:
+    if not stats.values:
+        return HeaderElement(key)
 
     # Use majority-based type detection instead of all()
-    majority = _majority_type(values, cfg.sparsity_threshold)
+    majority = _majority_type(stats, cfg.sparsity_threshold)
 
     if majority == "dict":
-        # Filter to only dict values for schema analysis
-        dict_values = [v for v in values if isinstance(v, dict)]
-        analysis = _analyze_keys(dict_values, cfg.sparsity_threshold)
-        nested_schema = [_create_header_element(k, dict_values, cfg) for k in analysis.common]
-        return HeaderElement(name=key, cfg=cfg, type="dict", schema=nested_schema, has_sparse=analysis.has_sparse)
+        # Only dict values contribute to the nested schema
+        analysis = _analyze_keys(stats, cfg.sparsity_threshold)
+        nested_schema = [_create_header_element(k, stats.fields[k], cfg) for k in analysis.common]
+        return HeaderElement(key, HeaderElement.DICT, nested_schema, analysis.has_sparse)
 
     if majority == "list":
-        # Flatten all list items, filtering out None
-        list_values = [v for v in values if isinstance(v, list)]
-        all_items = [x for sublist in list_values for x in sublist if x is not None]
-
-        # Use majority-based detection for list items too
-        item_majority = _majority_type(all_items, cfg.sparsity_threshold)
+        # Use majority-based detection for the flattened, non-None list items too
+        items = stats.items or _Stats()
+        item_majority = _majority_type(items, cfg.sparsity_threshold)
 
         if item_majority == "dict":
-            dict_items = [x for x in all_items if isinstance(x, dict)]
-            analysis = _analyze_keys(dict_items, cfg.sparsity_threshold)
-            nested_schema = [_create_header_element(k, dict_items, cfg) for k in analysis.common]
-            return HeaderElement(
-                name=key, cfg=cfg, type="list", list_type="dict", schema=nested_schema, has_sparse=analysis.has_sparse
-            )
+            analysis = _analyze_keys(items, cfg.sparsity_threshold)
+            nested_schema = [_create_header_element(k, items.fields[k], cfg) for k in analysis.common]
+            return HeaderElement(key, HeaderElement.DICT_LIST, nested_schema, analysis.has_sparse)
 
-        return HeaderElement(name=key, cfg=cfg, type="list", list_type="simple")
+        return HeaderElement(key, HeaderElement.LIST)
 
-    return HeaderElement(name=key, cfg=cfg)
+    return HeaderElement(key)
 
 
-def _build_header(items: list[dict], cfg: Config) -> list[HeaderElement]:
-    if not items:
-        return []
+def _build_header(stats: _Stats, cfg: AnyConfig) -> list[HeaderElement]:
+    analysis = _analyze_keys(stats, cfg.sparsity_threshold)
+    return [_create_header_element(key, stats.fields[key], cfg) for key in analysis.common]
 
-    all_keys = dict.fromkeys(key for item in items for key in item)
-    return [
-        _create_header_element(key, items, cfg)
-        for key in all_keys
-        if sum(1 for item in items if key in item) / len(items) >= cfg.sparsity_threshold
-    ]
 
+# --- Schema cache ---
 
-def _format_dict_pairs(data: dict, cfg: Config) -> list[str]:
+
+class _FingerprintError(Exception):
+    """A header key other than str: 1 and True are equal as keys but name different columns."""
+
+
+def _value_fingerprint(values: list, threshold: float) -> tuple:
+    """What `_create_header_element` decides for the values at one path, without _Stats.
+
+    () is a plain value, ("{", keys) a dict, ("[",) a list and ("[{", keys) a list of
+    dicts, where keys is `_dict_fingerprint` of the dicts below.
+    """
+    types = set(map(type, values))
+    # Scalars are plain values, unless a threshold of 0 makes even no dicts a majority
+    if threshold > 0 and not any(issubclass(t, (dict, list)) for t in types):
+        return ()
+    total = len(values) - (sum(v is None for v in values) if _NONE_TYPE in types else 0)
+    if not total:
+        return ()
+    dicts = values if types == _DICT_TYPES else [v for v in values if isinstance(v, dict)]
+    if len(dicts) / total >= threshold:
+        return "{", _dict_fingerprint(dicts, threshold)
+    lists = values if types == _LIST_TYPES else [v for v in values if isinstance(v, list)]
+    if len(lists) / total < threshold:
+        return ()
+    items = _value_fingerprint([x for value in lists for x in value], threshold)
+    return ("[{", items[1]) if items[:1] == ("{",) else ("[",)
+
+
+def _dict_fingerprint(dicts: list[dict], threshold: float) -> tuple:
+    """The common keys of dicts in first-seen order with their fingerprints, and whether any key is sparse.
+
+    Only the distinct key tuples are counted, so the sparsity decisions cost one
+    pass per shape rather than per row; values are only visited below common keys.
+    """
+    shapes = Counter(map(tuple, dicts))
+    present: dict[Any, int] = {}
+    for shape, n in shapes.items():
+        for key in shape:
+            present[key] = present.get(key, 0) + n
+    total = len(dicts)
+    fields = []
+    for key, n in present.items():
+        if n / total < threshold:
+            continue
+        if type(key) is not str:
+            raise _FingerprintError
+        column = list(map(itemgetter(key), dicts)) if n == total else [d[key] for d in dicts if key in d]
+        fields.append((key, _value_fingerprint(column, threshold)))
+    return tuple(fields), len(fields) < len(present)
+
+
+def _fingerprint(rows: Sequence, threshold: float, columns: Columns | None = None) -> tuple:
+    """Everything `_build_header` decides for the sampled rows (indices into columns, for columnar data).
+
+    Two inputs with the same fingerprint infer the same header under the same config.
+    """
+    if columns is None:
+        return _dict_fingerprint([row for row in rows if isinstance(row, dict)], threshold)
+    if not rows:
+        return (), False
+    if threshold > 1:  # Every column is present in every row, so none is common
+        return (), bool(columns.names)
+    if not all(type(name) is str for name in columns.names):
+        raise _FingerprintError
+    return tuple((name, _value_fingerprint(columns.take(name, rows), threshold)) for name in columns.names), False
+
+
+class SchemaCache:
+    """Bounded LRU cache of prepared encoders, used when `schema_cache=True`.
+
+    Entries are keyed by the frozen Config plus a structural fingerprint of the
+    sampled rows, taken before any statistics are gathered: the key tuples at each
+    path, which of their keys pass the sparsity threshold, and whether values are
+    mostly dicts, lists or scalars. Only those outcomes are kept, not the counts
+    behind them, so payloads of the same shape hit whatever their row counts. A hit
+    skips header inference (the statistics pass and building the header), the
+    per-column formatters (and codegen) and the header lines; the output is the same
+    as without the cache. Most useful for many small payloads of the same shape, such
+    as pages of one API endpoint.
+
+    Args:
+        maxsize: Maximum number of entries kept; least recently used are evicted first
+
+    Examples:
+        from minemizer.core import schema_cache
+        schema_cache.maxsize = 1024
+        minemize(page, schema_cache=True)
+        print(schema_cache.hits, schema_cache.misses)
+    """
+
+    def __init__(self, maxsize: int = 128):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple, dict[str, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __repr__(self) -> str:
+        return f"SchemaCache(maxsize={self.maxsize}, size={len(self)}, hits={self.hits}, misses={self.misses})"
+
+    @staticmethod
+    def key(rows: Sequence, cfg: FrozenConfig, columns: Columns | None = None) -> tuple | None:
+        """Cache key for the sampled rows (indices into columns for columnar data), or None if not cacheable."""
+        try:
+            return cfg, _fingerprint(rows, cfg.sparsity_threshold, columns)
+        except _FingerprintError:
+            return None
+
+    def get(self, key: tuple) -> dict[str, Any] | None:
+        """Return the encoder state stored under key, counting a hit or a miss."""
+        with self._lock:
+            state = self._entries.get(key)
+            if state is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return state
+
+    def put(self, key: tuple, state: dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[key] = state
+            while len(self._entries) > max(self.maxsize, 0):
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all entries and reset the hit/miss counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+
+# Shared by every Encoder (and minemize() call) with schema_cache=True
+schema_cache = SchemaCache()
+
+
+def _format_dict_pairs(data: dict, cfg: AnyConfig) -> list[str]:
     return [cfg.format_kv(k, _normalize(v)) for k, v in data.items()]
 
 
-def _format_dict(data: dict, element: HeaderElement, cfg: Config) -> str:
+def _format_dict(data: dict, element: HeaderElement, cfg: AnyConfig) -> str:
     if not data:
         return f"{cfg.dict_open.rstrip()}{cfg.dict_close.lstrip()}"
 
@@ -173,19 +463,18 @@ def _format_dict(data: dict, element: HeaderElement, cfg: Config) -> str:
     sparse_pairs = []
     if element.has_sparse:
         # Use _format_any_value for recursive formatting of sparse values
-        sparse_pairs = [
-            cfg.format_kv(k, _format_any_value(v, cfg)) for k, v in data.items() if k not in element.schema_keys
-        ]
+        schema_keys = element.schema_keys
+        sparse_pairs = [cfg.format_kv(k, _format_any_value(v, cfg)) for k, v in data.items() if k not in schema_keys]
 
     content = cfg.spaced_delimiter.join(common_values + sparse_pairs)
     return f"{cfg.dict_open}{content}{cfg.dict_close}"
 
 
-def _format_list(data: list, element: HeaderElement, cfg: Config) -> str:
+def _format_list(data: list, element: HeaderElement, cfg: AnyConfig) -> str:
     if not data:
         return f"{cfg.list_open.rstrip()}{cfg.list_close.lstrip()}"
 
-    if element.list_type == "dict":
+    if element.kind == HeaderElement.DICT_LIST:
         # Check each item type, fall back if not dict
         formatted = []
         for item in data:
@@ -199,18 +488,18 @@ def _format_list(data: list, element: HeaderElement, cfg: Config) -> str:
     return f"{cfg.list_open}{cfg.spaced_delimiter.join(_format_any_value(x, cfg) for x in data)}{cfg.list_close}"
 
 
-def _format_value(value: Any, element: HeaderElement, cfg: Config) -> str:
+def _format_value(value: Any, element: HeaderElement, cfg: AnyConfig) -> str:
     if value is None:
         return ""
 
     # Check actual type matches expected schema type
-    if element.type == "dict":
+    if element.kind == HeaderElement.DICT:
         if isinstance(value, dict):
             return _format_dict(value, element, cfg)
         # Type mismatch - fall back to recursive formatter
         return _format_any_value(value, cfg)
 
-    if element.type == "list":
+    if element.kind in (HeaderElement.LIST, HeaderElement.DICT_LIST):
         if isinstance(value, list):
             return _format_list(value, element, cfg)
         # Type mismatch - fall back to recursive formatter
@@ -219,7 +508,7 @@ def _format_value(value: Any, element: HeaderElement, cfg: Config) -> str:
     return _normalize(value)
 
 
-def _format_sparse_field(key: str, value: Any, cfg: Config) -> str:
+def _format_sparse_field(key: str, value: Any, cfg: AnyConfig) -> str:
     if isinstance(value, dict):
         if not value:
             return f"{key}{cfg.dict_open.rstrip()}{cfg.dict_close.lstrip()}"
@@ -237,27 +526,21 @@ def _format_sparse_field(key: str, value: Any, cfg: Config) -> str:
     return cfg.format_kv(key, _normalize(value))
 
 
-def _format_row(item: dict, header: list[HeaderElement], cfg: Config) -> str:
+def _format_row(item: dict, header: list[HeaderElement], cfg: AnyConfig) -> str:
     header_keys = {el.name for el in header}
     header_parts = [_format_value(item.get(el.name), el, cfg) for el in header]
     sparse_parts = [_format_sparse_field(k, item[k], cfg) for k in item if k not in header_keys]
     return cfg.spaced_delimiter.join(header_parts + sparse_parts)
 
 
-def _serialize(data: list[dict], cfg: Config) -> str:
-    header = _build_header(data, cfg)
-    rows = [cfg.cleanup(_format_row(item, header, cfg)) for item in data]
-    header_str = cfg.cleanup(cfg.spaced_delimiter.join(h.to_string() for h in header))
+def _serialize_reference(data: list[dict], cfg: AnyConfig) -> str:
+    """Reference implementation: format rows, then clean them up with str.replace passes.
 
-    # Build header block (header + optional separator)
-    header_block = [header_str]
-    if cfg.header_separator:
-        sep_row = cfg.spaced_delimiter.join(cfg.header_separator for _ in header)
-        header_block.append(sep_row)
-
-    # Apply schema_prefix to header block lines
-    if cfg.schema_prefix:
-        header_block = [f"{cfg.schema_prefix}{line}" for line in header_block]
+    Not used by the public API; kept to diff the emitter and streaming paths against.
+    """
+    header = _build_header(_collect_stats(data), cfg)
+    rows = [cfg.cleanup(_format_row(item, header, cfg)) for item in data]
+    header_block = _header_block(header, cfg)
 
     # Apply row_prefix to data rows
     if cfg.row_prefix:
@@ -286,13 +569,1062 @@ def _serialize(data: list[dict], cfg: Config) -> str:
     return text_str
 
 
+# --- Emitter ---
+
+
+class _Unsafe(Exception):  # noqa: N818 - internal control flow, not an error
+    """Raised when only the reference cleanup reproduces a row exactly."""
+
+
+class _Emitter:
+    """Formats rows directly into the text Config.cleanup() would produce.
+
+    cleanup() drops the space between two structural tokens (delimiter, `:`,
+    openers, closers) and before true/false/null following a delimiter or `:`.
+    The emitter writes only the spaces that survive, so no replace passes are
+    needed. Text that cleanup() would rewrite itself (values containing structural
+    characters, a colon next to a space, or only spaces) and three openers in a row
+    (where cleanup() keeps every second space) raise _Unsafe, and the row takes the
+    reference path.
+    """
+
+    __slots__ = ("delimiter", "trueish", "unsafe")
+
+    def __init__(self, cfg: AnyConfig):
+        self.delimiter = cfg.delimiter
+        self.trueish = ("true", "false", "null") if cfg.common_optimizations else ()
+        self.unsafe = frozenset(f"{cfg.delimiter}{{}}[]\n")
+
+    @staticmethod
+    def supports(cfg: AnyConfig) -> bool:
+        """Without spaces cleanup() is a no-op; odd delimiters keep the reference path."""
+        d = cfg.delimiter
+        return cfg.use_spaces and bool(d) and not any(c.isspace() or c.isalnum() or c in ":{}[].-+" for c in d)
+
+    def atom(self, text: str) -> str:
+        if text:
+            if not self.unsafe.isdisjoint(text) or text.isspace():
+                raise _Unsafe
+            # Colons (times, URLs) are only rewritten by cleanup() when next to a space
+            if ":" in text and (text[0] == ":" or ": " in text or " :" in text):
+                raise _Unsafe
+        return text
+
+    def accepts(self, texts: list[str]) -> bool:
+        """Whether atom() returns every text unchanged, checked over the whole batch."""
+        chars = "".join(texts)
+        if not self.unsafe.isdisjoint(chars) or any(map(str.isspace, texts)):
+            return False
+        if ":" in chars:
+            # Newlines are unsafe, so they cannot occur inside texts and mark the starts
+            joined = "\n".join(texts)
+            return not (joined[0] == ":" or ": " in joined or " :" in joined or "\n:" in joined)
+        return True
+
+    def scalar(self, value: Any) -> str:
+        t = type(value)
+        if t is int or t is float:
+            return str(value)
+        return self.atom(_normalize(value))
+
+    def kv(self, key: Any, value: str) -> str:
+        key = self.atom(f"{key}")
+        if not value or value[0] in "{[" or value.startswith(self.trueish):
+            return f"{key}:{value}"
+        return f"{key}: {value}"
+
+    def join(self, parts: list[str], opener: str, closer: str) -> str:
+        """Join parts with the delimiter inside opener/closer ("" for a whole row)."""
+        out = [opener]
+        for i, part in enumerate(parts):
+            if i:
+                out.append(self.delimiter)
+            elif not opener:
+                out.append(part)
+                continue
+            if not part:
+                continue
+            first = part[0]
+            if first in "{[:":
+                if first == opener and not i and part[1:2] == first:
+                    raise _Unsafe
+                out.append(part)
+            elif i and part.startswith(self.trueish):
+                out.append(part)
+            else:
+                out.append(" ")
+                out.append(part)
+        out.append(closer)
+        return "".join(out)
+
+    def row(self, parts: list[str], trailing_gap: bool) -> str:
+        """Join top-level parts; trailing_gap marks a last `key: ` part with an empty value."""
+        text = self.join(parts, "", "")
+        if trailing_gap or (len(parts) > 1 and not parts[-1]):
+            return f"{text} "
+        return text
+
+
+def _emit_any(value: Any, e: _Emitter) -> str:
+    """Emitter counterpart of _format_any_value."""
+    if value is None:
+        return ""
+    if isinstance(value, dict):
+        if not value:
+            return "{}"
+        return e.join([e.kv(k, _emit_any(v, e)) for k, v in value.items()], "{", "}")
+    if isinstance(value, list):
+        if not value:
+            return "[]"
+        return e.join([_emit_any(x, e) for x in value], "[", "]")
+    return e.scalar(value)
+
+
+class _ShapeCache:
+    """Remember, per key tuple, which keys of a dict are not covered by a schema.
+
+    Real datasets have a handful of row shapes, so after the first row of each shape
+    the sparse keys are a dict lookup instead of a membership test per key. Positions
+    rather than keys are cached: `(1,)` and `(True,)` are equal tuples, but must keep
+    formatting their own keys.
+    """
+
+    __slots__ = ("known", "shapes")
+
+    def __init__(self, known: Iterable[str]):
+        self.known = frozenset(known)
+        self.shapes: dict[tuple, tuple[int, ...]] = {}
+
+    def sparse(self, data: dict) -> tuple[tuple, tuple[int, ...]]:
+        """Return the key tuple of data and the positions of its sparse keys."""
+        shape = tuple(data)
+        positions = self.shapes.get(shape)
+        if positions is None:
+            known = self.known
+            positions = tuple(i for i, k in enumerate(shape) if k not in known)
+            if len(self.shapes) < _SHAPE_CACHE_SIZE:
+                self.shapes[shape] = positions
+        return shape, positions
+
+
+def _emit_or_none(emit: Callable[[Any], str], value: Any) -> str | None:
+    try:
+        return emit(value)
+    except _Unsafe:
+        return None
+
+
+def _format_scalar_batch(values: list, e: _Emitter | None) -> list[str] | None:
+    """Format a column of int/float/bool/str/None values in one pass, or return None.
+
+    The text is exactly what the per-value formatters produce: numbers never hold
+    characters the emitter rejects, and strings are checked as one batch.
+    """
+    types = set(map(type, values))
+    if types <= _NUMBER_TYPES:
+        return list(map(str, values))
+    if types <= _TEXT_TYPES:
+        texts = [v or "" for v in values] if _NONE_TYPE in types else list(values)
+        return texts if e is None or e.accepts(texts) else None
+    if not types <= _SCALAR_TYPES:
+        return None
+    return ["" if v is None else ("true" if v else "false") if type(v) is bool else str(v) for v in values]
+
+
+def _emit_sparse_field(key: Any, value: dict | list, e: _Emitter) -> str:
+    """Emitter counterpart of _format_sparse_field for dict and list values."""
+    return f"{e.atom(f'{key}')}{_emit_any(value, e)}"
+
+
+def _emit_dict_formatter(element: HeaderElement, e: _Emitter) -> Callable[[dict], str]:
+    """Emitter counterpart of _format_dict, with the child dispatch resolved up front."""
+    children = tuple((child.name, _emit_column(child, e)) for child in element.schema)
+    shapes = _ShapeCache(element.schema_keys) if element.has_sparse else None
+
+    def emit_dict(data: dict) -> str:
+        if not data:
+            return "{}"
+        parts = [emit(data.get(name)) for name, emit in children]
+        if shapes is not None:
+            keys, positions = shapes.sparse(data)
+            for i in positions:
+                k = keys[i]
+                parts.append(e.kv(k, _emit_any(data[k], e)))
+        return e.join(parts, "{", "}")
+
+    return emit_dict
+
+
+def _emit_column(element: HeaderElement, e: _Emitter) -> Callable[[Any], str]:
+    """Emitter counterpart of _column_formatter."""
+    if element.kind == HeaderElement.DICT:
+        emit_dict = _emit_dict_formatter(element, e)
+
+        def emit_dict_column(value: Any) -> str:
+            if isinstance(value, dict):
+                return emit_dict(value)
+            return _emit_any(value, e)
+
+        return emit_dict_column
+
+    if element.kind == HeaderElement.DICT_LIST:
+        emit_item = _emit_dict_formatter(element, e)
+
+        def emit_dict_list_column(value: Any) -> str:
+            if not isinstance(value, list) or not value:
+                return _emit_any(value, e)
+            return e.join([emit_item(x) if isinstance(x, dict) else _emit_any(x, e) for x in value], "[", "]")
+
+        return emit_dict_list_column
+
+    if element.kind == HeaderElement.LIST:
+        # Simple lists format every item without schema, exactly like _emit_any
+        return lambda value: _emit_any(value, e)
+
+    def emit_value_column(value: Any) -> str:
+        return "" if value is None else e.scalar(value)
+
+    return emit_value_column
+
+
+def _column_formatter(element: HeaderElement, cfg: AnyConfig) -> Callable[[Any], str]:
+    """Resolve the HeaderElement dispatch for one header column up front."""
+    if element.kind == HeaderElement.DICT:
+
+        def format_dict_column(value: Any) -> str:
+            if value is None:
+                return ""
+            if isinstance(value, dict):
+                return _format_dict(value, element, cfg)
+            return _format_any_value(value, cfg)
+
+        return format_dict_column
+
+    if element.kind in (HeaderElement.LIST, HeaderElement.DICT_LIST):
+
+        def format_list_column(value: Any) -> str:
+            if value is None:
+                return ""
+            if isinstance(value, list):
+                return _format_list(value, element, cfg)
+            return _format_any_value(value, cfg)
+
+        return format_list_column
+
+    def format_value_column(value: Any) -> str:
+        return "" if value is None else _normalize(value)
+
+    return format_value_column
+
+
+def _header_block(header: list[HeaderElement], cfg: AnyConfig) -> list[str]:
+    """Build the header lines (header + optional separator), prefixed with schema_prefix."""
+    header_block = [cfg.cleanup(cfg.spaced_delimiter.join(h.to_string(cfg) for h in header))]
+    if cfg.header_separator:
+        header_block.append(cfg.spaced_delimiter.join(cfg.header_separator for _ in header))
+
+    if cfg.schema_prefix:
+        header_block = [f"{cfg.schema_prefix}{line}" for line in header_block]
+    return header_block
+
+
+def _finish_line(line: str, strip: str, last: bool) -> str:
+    """Apply the document-level cleanup to a single output line.
+
+    Equivalent to running `replace(" \\n", "\\n")` and three `replace(strip + "\\n", "\\n")`
+    passes over the joined document: every match ends at a newline, so each line can
+    be handled on its own. The last line only loses one trailing space.
+    """
+    if "\n" in line:
+        # Embedded newlines in values: run the document passes over this line
+        text = line if last else f"{line}\n"
+        text = text.replace(" \n", "\n")
+        if strip:
+            for _ in range(3):
+                text = text.replace(f"{strip}\n", "\n")
+        if last:
+            return text[:-1] if text.endswith(" ") else text
+        return text[:-1]
+
+    if line.endswith(" "):
+        line = line[:-1]
+    if strip and not last:
+        for _ in range(3):
+            if not line.endswith(strip):
+                break
+            line = line[: -len(strip)]
+    return line
+
+
+def _text_writer(fp: Any, encoding: str) -> Callable[[str], Any]:
+    """Return a callable writing str to a text stream, binary stream or socket."""
+    if hasattr(fp, "sendall"):
+        return lambda text: fp.sendall(text.encode(encoding))
+    if isinstance(fp, io.TextIOBase):
+        return fp.write
+    if isinstance(fp, (io.RawIOBase, io.BufferedIOBase)) or "b" in str(getattr(fp, "mode", "")):
+        return lambda text: fp.write(text.encode(encoding))
+    return fp.write
+
+
+def _stream_source(
+    data: Iterable[dict] | dict | Columns, cfg: FrozenConfig, schema: Iterable[HeaderElement] | None = None
+) -> tuple[list | Columns | None, Iterable[dict] | Columns]:
+    """Split streaming input into the rows to infer the header from and the rows to format.
+
+    With a schema nothing is inferred, so the sample is None.
+    """
+    columns = _as_columns(data)
+    if columns is not None:
+        return (columns if schema is None else None), columns
+    if isinstance(data, dict):
+        data = [data]
+    if schema is not None:
+        return None, data
+    if isinstance(data, list):
+        return data, data
+
+    # Only the first rows can be sampled without buffering the whole input
+    if cfg.schema_sample_mode != "head":
+        raise ValueError(f"schema_sample_mode={cfg.schema_sample_mode!r} needs a list, not a one-shot iterable")
+    rows = iter(cast("Iterable[dict]", data))
+    sample = list(islice(rows, cfg.schema_sample or _STREAM_SCHEMA_ROWS))
+    return sample, chain(sample, rows)
+
+
+def _iter_chunks(rows: Iterable[dict] | Columns, size: int) -> Iterator[list[dict] | Columns]:
+    """Split rows into consecutive chunks of size rows (Columns are sliced)."""
+    columns = _as_columns(rows)
+    if columns is not None:
+        for start in range(0, len(columns), size):
+            yield columns.slice(start, start + size)
+        return
+    it = iter(cast("Iterable[dict]", rows))
+    while chunk := list(islice(it, size)):
+        yield chunk
+
+
+def _resolve_config(preset: AnyConfig | None, overrides: dict[str, Any]) -> FrozenConfig:
+    """Start from preset, the using() config or the global config, apply overrides and freeze the result."""
+    if preset is None:
+        scoped = _scoped_config.get()
+        base = scoped if scoped is not None else _global_config
+    else:
+        base = preset
+    return base.derive(**overrides).freeze()
+
+
 # --- Public API ---
 
 
+@dataclass
+class BudgetResult:
+    """Output of `Encoder.encode_budget()`: the text and how much of the input it holds."""
+
+    text: str
+    rows: int  # Leading rows of the input included in text
+    total_rows: int  # Rows in the input
+    tokens: int | None = None  # Exact token count of text, when a token budget was given
+
+    @property
+    def truncated(self) -> bool:
+        return self.rows < self.total_rows
+
+
+@dataclass
+class Records(Sequence[str]):
+    """Output of `Encoder.encode_records()`: one header block and one row per input record.
+
+    `records[i]` is the row of the i-th input record, even if its values contain
+    newlines, and `records.document(i)` is that record on its own under the header,
+    exactly as `encode([record])` would write it.
+    """
+
+    header: str  # Header line(s): schema, plus separator line if the config has one
+    rows: list[str]
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    @overload
+    def __getitem__(self, index: int) -> str: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[str]: ...
+
+    def __getitem__(self, index: int | slice) -> str | list[str]:
+        return self.rows[index]
+
+    def document(self, index: int) -> str:
+        """Return a self-contained document for one record: the header and its row."""
+        return f"{self.header}\n{self.rows[index]}"
+
+
+class Encoder:
+    """Reusable minemizer with a fixed schema and a precompiled formatting plan.
+
+    Build it once from sample data (or an explicit header) and call `encode()` for
+    every payload of the same shape. Config derivation, header inference and the
+    per-column HeaderElement dispatch all happen in the constructor, so the global
+    config is captured at construction time.
+
+    Args:
+        sample: A list of dicts (or a single dict, or columnar data) to infer the header from
+        schema: A Schema, or an explicit header such as `Encoder(sample).header` of a previous encoder
+        preset: Pre-configured Config (e.g., presets.markdown, presets.csv)
+        **overrides: Any Config field, as accepted by minemize()
+
+    Examples:
+        encoder = Encoder(first_page, preset=presets.compact)
+        for page in pages:
+            send(encoder.encode(page))
+    """
+
+    def __init__(
+        self,
+        sample: list | dict | Columns | None = None,
+        *,
+        schema: Iterable[HeaderElement] | None = None,
+        preset: AnyConfig | None = None,
+        **overrides: Any,
+    ):
+        if (sample is None) == (schema is None):
+            raise ValueError("Encoder needs either sample data or a schema")
+
+        # Frozen, so later changes to the global config (or preset) do not leak in
+        cfg = self.config = _resolve_config(preset, overrides)
+        cache_key = None
+        if schema is None:
+            columns = _as_columns(sample)
+            if columns is not None:
+                rows = _sample_rows(range(len(columns)), cfg)
+            else:
+                rows = _sample_rows([sample] if isinstance(sample, dict) else cast("list[dict]", sample), cfg)
+            if cfg.schema_cache:
+                # Looked up before inference: a hit skips the statistics pass too
+                cache_key = schema_cache.key(rows, cfg, columns)
+                state = schema_cache.get(cache_key) if cache_key is not None else None
+                if state is not None:
+                    self.__dict__.update(state)
+                    self.header = list(self.header)
+                    return
+            stats = _collect_column_stats(columns, rows) if columns is not None else _collect_stats(rows)
+            schema = _build_header(stats, cfg)
+
+        self.header = list(schema)
+        self._shapes = _ShapeCache(el.name for el in self.header)
+        self._plan = tuple((el.name, _column_formatter(el, cfg)) for el in self.header)
+        self._emitter = _Emitter(cfg) if _Emitter.supports(cfg) else None
+        if self._emitter is not None:
+            emit_column = _emit_column
+            if cfg.codegen:
+                from minemizer.codegen import compile_column as emit_column
+            self._emit_plan = tuple((el.name, emit_column(el, self._emitter)) for el in self.header)
+        # Value columns are tried as scalar batches before formatting value by value
+        self._scalar_columns = tuple(el.kind == HeaderElement.VALUE for el in self.header)
+
+        # Header lines are never the last line, so they can be finished once here
+        self._strip = cfg.delimiter if cfg.strip_trailing_delimiter else ""
+        self._header_lines = tuple(
+            _finish_line(line, self._strip, False) for line in self._wrap(_header_block(self.header, cfg))
+        )
+        if cache_key is not None:
+            schema_cache.put(cache_key, dict(self.__dict__))
+
+    def _wrap(self, lines: Iterable[str]) -> Iterable[str]:
+        """Wrap lines with cfg.wrap_lines (e.g., for markdown tables)."""
+        w = self.config.wrap_lines
+        return (f"{w}{line}{w}" for line in lines) if w else lines
+
+    def _emit_sparse(self, parts: list[str], pairs: Iterable[tuple[Any, Any]], e: _Emitter) -> str:
+        """Append sparse `key: value` fields to the emitted header parts and finish the row."""
+        trailing_gap = False
+        for k, v in pairs:
+            if isinstance(v, (dict, list)):
+                parts.append(_emit_sparse_field(k, v, e))
+                trailing_gap = False
+            else:
+                text = e.scalar(v)
+                parts.append(e.kv(k, text))
+                trailing_gap = not text
+        return e.row(parts, trailing_gap)
+
+    def _format_raw(self, values: Iterable[Any], pairs: Iterable[tuple[Any, Any]]) -> str:
+        """Format a row with the reference formatters and cleanup(), for text the emitter rejects."""
+        cfg = self.config
+        parts = [format_column(v) for (_, format_column), v in zip(self._plan, values, strict=True)]
+        parts.extend(_format_sparse_field(k, v, cfg) for k, v in pairs)
+        return cfg.cleanup(cfg.spaced_delimiter.join(parts))
+
+    def _format_row(self, item: dict) -> str:
+        keys, positions = self._shapes.sparse(item)
+        return self._format_raw(
+            (item.get(name) for name, _ in self._plan), [(keys[i], item[keys[i]]) for i in positions]
+        )
+
+    def _column_texts(self, values: list, column: int) -> Sequence[str | None]:
+        """Format one header column for a block of rows; None marks values the emitter rejected."""
+        if self._scalar_columns[column]:
+            texts = _format_scalar_batch(values, self._emitter)
+            if texts is not None:
+                return texts
+
+        e = self._emitter
+        if e is None:
+            return list(map(self._plan[column][1], values))
+        emit = self._emit_plan[column][1]
+        try:
+            return list(map(emit, values))
+        except _Unsafe:
+            return [_emit_or_none(emit, v) for v in values]
+
+    def _format_block(
+        self, columns: list[list], pairs: Sequence[Sequence[tuple[Any, Any]]], fallback: Callable[[int], str]
+    ) -> list[str]:
+        """Format a block of rows given column by column.
+
+        `columns` holds the values of every header column, `pairs` the sparse fields
+        of every row, and `fallback(j)` formats row j on the reference path.
+        """
+        texts = [self._column_texts(values, c) for c, values in enumerate(columns)]
+        e = self._emitter
+        cfg = self.config
+        if e is None:
+            lines = []
+            for sparse, parts in zip(pairs, zip(*texts, strict=True) if texts else repeat(()), strict=False):
+                parts = [*parts, *(_format_sparse_field(k, v, cfg) for k, v in sparse)]
+                lines.append(cfg.cleanup(cfg.spaced_delimiter.join(parts)))
+        else:
+            rejected: set[int] = set()
+            for c, column in enumerate(texts):
+                if None in column:
+                    rejected.update(j for j, text in enumerate(column) if text is None)
+                    texts[c] = [text or "" for text in column]
+            emitted = cast("list[list[str]]", texts)  # Rejected values are blank now
+            lines = self._join_rows(emitted, len(pairs), e)
+            # Rows with sparse fields or rejected values are the exception: redo them one by one
+            for j, sparse in enumerate(pairs):
+                if j in rejected:
+                    lines[j] = fallback(j)
+                elif sparse:
+                    try:
+                        lines[j] = self._emit_sparse([column[j] for column in emitted], sparse, e)
+                    except _Unsafe:
+                        lines[j] = fallback(j)
+
+        if cfg.row_prefix or cfg.wrap_lines:
+            return list(map(self._decorate, lines))
+        return lines
+
+    def _join_rows(self, texts: list[list[str]], n: int, e: _Emitter) -> list[str]:
+        """Join emitted column texts into rows exactly like `_Emitter.row()`, a column at a time.
+
+        A part gets no space after the delimiter when it is empty or starts with an
+        opener, a colon or true/false/null; an empty last part leaves a trailing space.
+        Columns where no part needs that (numbers, most text) are joined with one
+        precomputed separator, like csv.writer does.
+        """
+        if len(texts) < 2:
+            return list(texts[0]) if texts else [""] * n
+
+        d = e.delimiter
+        spaced = f"{d} "
+        no_gap = ("{", "[", ":", *e.trueish)
+        last = len(texts) - 1
+        gapped = [False] + [
+            (c == last or "" not in texts[c]) and not any(map(str.startswith, texts[c], repeat(no_gap)))
+            for c in range(1, len(texts))
+        ]
+        if all(gapped[1:]):
+            return list(map(spaced.join, zip(*texts, strict=True)))
+
+        cells = [texts[0]]
+        for c in range(1, len(texts)):
+            column = texts[c]
+            if gapped[c]:
+                cells.append([f"{spaced}{t}" for t in column])
+            elif c == last:
+                cells.append([f"{d}{t}" if t.startswith(no_gap) else f"{spaced}{t}" for t in column])
+            else:
+                cells.append([f"{d}{t}" if not t or t.startswith(no_gap) else f"{spaced}{t}" for t in column])
+        return list(map("".join, zip(*cells, strict=True)))
+
+    def _format_rows(self, block: list[dict]) -> list[str]:
+        """Format a block of row dicts as unfinished output lines."""
+        shapes = self._shapes
+        pairs = []
+        for item in block:
+            keys, positions = shapes.sparse(item)
+            pairs.append([(keys[i], item[keys[i]]) for i in positions] if positions else ())
+        columns = [[item.get(name) for item in block] for name, _ in self._plan]
+        return self._format_block(columns, pairs, lambda j: self._format_row(block[j]))
+
+    def _format_column_block(self, columns: Columns, start: int, stop: int) -> list[str]:
+        """Format rows start:stop of columnar data as unfinished output lines."""
+        n = min(stop, len(columns)) - start
+        present = set(columns.names)
+        header_names = {name for name, _ in self._plan}
+        sparse = [name for name in columns.names if name not in header_names]
+        values = [columns.column(name, start, stop) if name in present else [None] * n for name, _ in self._plan]
+        if sparse:
+            sparse_values = [columns.column(name, start, stop) for name in sparse]
+            pairs = [list(zip(sparse, row, strict=True)) for row in zip(*sparse_values, strict=True)]
+        else:
+            pairs = [()] * n
+
+        def fallback(j: int) -> str:
+            return self._format_raw((column[j] for column in values), pairs[j])
+
+        return self._format_block(values, pairs, fallback)
+
+    def _decorate(self, line: str) -> str:
+        """Apply row_prefix and wrap_lines to a formatted row."""
+        cfg = self.config
+        if cfg.row_prefix:
+            line = f"{cfg.row_prefix}{line}"
+        if cfg.wrap_lines:
+            line = f"{cfg.wrap_lines}{line}{cfg.wrap_lines}"
+        return line
+
+    def _iter_lines(self, rows: Iterable[dict] | Columns) -> Iterator[str]:
+        """Yield unfinished output lines for rows, in order, formatting _BLOCK_ROWS rows at a time."""
+        columns = _as_columns(rows)
+        if columns is not None:
+            for start in range(0, len(columns), _BLOCK_ROWS):
+                yield from self._format_column_block(columns, start, start + _BLOCK_ROWS)
+            return
+        it = iter(cast("Iterable[dict]", rows))
+        while block := list(islice(it, _BLOCK_ROWS)):
+            yield from self._format_rows(block)
+
+    def iter_encode(self, rows: Iterable[dict] | Columns) -> Iterator[str]:
+        """Yield output lines (without newlines) for rows, one at a time.
+
+        Headers are repeated every `header_repeat_interval` rows, but never after the
+        last row. Rows are read and formatted in blocks of a few hundred.
+        """
+        header_lines = self._header_lines
+        for after_header, line in self._iter_rows(rows):
+            if after_header:
+                yield from header_lines
+            yield line
+
+    def _iter_rows(self, rows: Iterable[dict] | Columns) -> Iterator[tuple[bool, str]]:
+        """Yield (after_header, finished line) per row, flagging rows that a header block precedes."""
+        lines = self._iter_lines(rows)
+        line = next(lines, None)
+        if line is None:
+            return
+
+        strip = self._strip
+        interval = self.config.header_repeat_interval
+        after_header = True
+        count = 1
+        for next_line in lines:
+            yield after_header, _finish_line(line, strip, False)
+            after_header = bool(interval) and count % interval == 0
+            line = next_line
+            count += 1
+        yield after_header, _finish_line(line, strip, True)
+
+    def encode(self, data: list | dict | Columns) -> str:
+        """Minemize data against the precompiled schema.
+
+        Keys missing from the schema are written as sparse `key: value` fields.
+        """
+        columns = _as_columns(data)
+        if columns is not None:
+            data = columns
+        elif isinstance(data, dict):
+            data = [data]
+        elif not isinstance(data, list):
+            return ""
+        if not len(data):
+            return ""
+
+        return "\n".join(self.iter_encode(data))
+
+    def encode_records(self, data: Iterable[dict] | dict | Columns) -> Records:
+        """Format every record as its own row string under the shared header, without joining them.
+
+        Rows are finished as standalone last lines, so `records.document(i)` equals
+        `encode([data[i]])`.
+        """
+        if isinstance(data, dict):
+            data = [data]
+        strip = self._strip
+        rows = [_finish_line(line, strip, True) for line in self._iter_lines(data)]
+        return Records(header="\n".join(self._header_lines), rows=rows)
+
+    def encode_budget(
+        self,
+        data: list | dict | Columns,
+        *,
+        max_tokens: int | None = None,
+        token_counter: Callable[[str], int] | None = None,
+        max_chars: int | None = None,
+    ) -> "BudgetResult":
+        """Minemize as many leading rows of data as fit into a token and/or character budget.
+
+        Rows are added one at a time with a per-line estimate (`token_counter(line + "\\n")`;
+        the first row that does not fit is tried once more as the last line, without
+        its newline), then the assembled text is counted exactly. If tokenization across line
+        boundaries pushed it over, the longest row prefix that fits is searched for with
+        a few more exact counts; if the estimates overcounted and budget is left, further
+        rows are added the same way until the next one would overflow. The header counts
+        towards the budget; if not even one row fits, the text is empty.
+
+        Args:
+            data: Rows as accepted by encode()
+            max_tokens: Token budget, measured with token_counter
+            token_counter: Returns the number of tokens in a string
+            max_chars: Character budget
+        """
+        budgets: list[tuple[int, Callable[[str], int]]] = []
+        if max_chars is not None:
+            budgets.append((max_chars, len))
+        if max_tokens is not None:
+            if token_counter is None:
+                raise ValueError("max_tokens needs a token_counter")
+            budgets.append((max_tokens, token_counter))
+
+        columns = _as_columns(data)
+        if columns is not None:
+            data = columns
+        elif isinstance(data, dict):
+            data = [data]
+        elif not isinstance(data, list):
+            data = []
+
+        raw = next(self._fit_runs(self._iter_lines(data), budgets, min_rows=0), [])
+        text = self._assemble(raw, len(raw)) if raw else ""
+        tokens = token_counter(text) if max_tokens is not None and token_counter is not None else None
+        return BudgetResult(text=text, rows=len(raw), total_rows=len(data), tokens=tokens)
+
+    def _fit_runs(
+        self, lines: Iterator[str], budgets: list[tuple[int, Callable[[str], int]]], min_rows: int
+    ) -> Iterator[list[str]]:
+        """Split unfinished row lines into consecutive runs whose documents fit the budgets.
+
+        Rows are added with a per-line estimate, then each run's assembled text is
+        counted exactly and the run shrunk or grown to the longest prefix that fits;
+        rows that did not fit start the next run. A run has at least min_rows rows
+        even if they exceed the budget. Stops after the first empty run.
+        """
+        strip = self._strip
+        interval = self.config.header_repeat_interval
+        header = "\n".join(self._header_lines) + "\n"
+        header_cost = [count(header) for _, count in budgets]
+        carried: deque[str] = deque()
+
+        def fits(used: list[int], cost: list[int]) -> bool:
+            return all(u + c <= limit for u, c, (limit, _) in zip(used, cost, budgets, strict=True))
+
+        def pull() -> str | None:
+            return carried.popleft() if carried else next(lines, None)
+
+        while True:
+            raw: list[str] = []
+            costs: list[list[int]] = []
+            used = header_cost
+            while (line := pull()) is not None:
+                prefix = header if raw and interval and len(raw) % interval == 0 else ""
+                cost = [count(f"{prefix}{_finish_line(line, strip, False)}\n") for _, count in budgets]
+                if len(raw) >= min_rows and not fits(used, cost):
+                    # As the last row it has no newline (and may lose a trailing space), so it may still fit
+                    cost = [count(prefix + _finish_line(line, strip, True)) for _, count in budgets]
+                    if fits(used, cost):
+                        raw.append(line)
+                        costs.append(cost)
+                    else:
+                        carried.appendleft(line)
+                    break
+                used = [u + c for u, c in zip(used, cost, strict=True)]
+                raw.append(line)
+                costs.append(cost)
+
+            rows = self._exact_fit(raw, costs, budgets, min_rows) if raw else 0
+            if rows == len(raw):
+                # Estimates can overcount too (say, a counter that rounds up): add rows while they fit exactly
+                rows = self._grow_fit(raw, budgets, pull)
+            if not raw:
+                return
+            carried.extendleft(reversed(raw[rows:]))
+            yield raw[:rows]
+            if not rows:
+                return
+
+    def _exact_fit(
+        self, raw: list[str], costs: list[list[int]], budgets: list[tuple[int, Callable[[str], int]]], min_rows: int
+    ) -> int:
+        """Longest prefix of raw (at least min_rows) whose assembled text fits the budgets exactly."""
+
+        def excess(rows: int) -> list[int]:
+            text = self._assemble(raw, rows)
+            return [count(text) - limit for limit, count in budgets]
+
+        rows = len(raw)
+        over = excess(rows)
+        if max(over, default=0) <= 0:
+            return rows
+        # Tokenization across lines pushed it over: drop the estimated excess, then binary search
+        guess = rows
+        while guess > min_rows and max(over) > 0:
+            guess -= 1
+            over = [e - c for e, c in zip(over, costs[guess], strict=True)]
+        lo, hi = (guess, rows - 1) if max(excess(guess)) <= 0 else (min_rows, guess - 1)
+        while lo < hi:
+            mid = (lo + hi + 1) // 2
+            lo, hi = (mid, hi) if max(excess(mid)) <= 0 else (lo, mid - 1)
+        return lo
+
+    def _grow_fit(
+        self, raw: list[str], budgets: list[tuple[int, Callable[[str], int]]], pull: Callable[[], str | None]
+    ) -> int:
+        """Extend raw, which fits the budgets, with pulled lines; returns how many of its rows fit exactly.
+
+        Gallops up in doubling steps until a prefix overflows or the lines run out, then
+        binary searches; raw may end with pulled lines that did not fit.
+        """
+
+        def fits(rows: int) -> bool:
+            text = self._assemble(raw, rows)
+            return all(count(text) <= limit for limit, count in budgets)
+
+        lo, step = len(raw), 1
+        while True:
+            while len(raw) < lo + step and (line := pull()) is not None:
+                raw.append(line)
+            hi = min(lo + step, len(raw))
+            if hi == lo:
+                return lo
+            if not fits(hi):
+                break
+            lo, step = hi, step * 2
+        hi -= 1
+        while lo < hi:
+            mid = (lo + hi + 1) // 2
+            lo, hi = (mid, hi) if fits(mid) else (lo, mid - 1)
+        return lo
+
+    def iter_chunks(
+        self,
+        rows: Iterable[dict] | Columns,
+        *,
+        rows_per_chunk: int | None = None,
+        tokens_per_chunk: int | None = None,
+        token_counter: Callable[[str], int] | None = None,
+    ) -> Iterator[str]:
+        """Yield self-contained documents, each with the header, for consecutive runs of rows.
+
+        Every chunk equals `encode()` of its rows. With tokens_per_chunk, chunks take
+        as many rows as fit (see encode_budget()); a row too large for any chunk gets
+        one of its own.
+        """
+        if (rows_per_chunk is None) == (tokens_per_chunk is None):
+            raise ValueError("Pass exactly one of rows_per_chunk or tokens_per_chunk")
+        lines = self._iter_lines(rows)
+        if rows_per_chunk is not None:
+            if rows_per_chunk < 1:
+                raise ValueError("rows_per_chunk must be at least 1")
+            runs = iter(lambda: list(islice(lines, rows_per_chunk)), [])
+        elif tokens_per_chunk is not None and token_counter is not None:
+            runs = self._fit_runs(lines, [(tokens_per_chunk, token_counter)], min_rows=1)
+        else:
+            raise ValueError("tokens_per_chunk needs a token_counter")
+        for run in runs:
+            yield self._assemble(run, len(run))
+
+    def _assemble(self, raw: list[str], rows: int) -> str:
+        """Join the first rows unfinished lines into a document, as iter_encode() would."""
+        strip = self._strip
+        interval = self.config.header_repeat_interval
+        lines = list(self._header_lines)
+        for i in range(rows):
+            if i and interval and i % interval == 0:
+                lines.extend(self._header_lines)
+            lines.append(_finish_line(raw[i], strip, i == rows - 1))
+        return "\n".join(lines)
+
+    def __getstate__(self) -> dict[str, Any]:
+        # Plans are closures: ship only the Config and header, rebuild on load
+        return {"config": self.config, "header": self.header}
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        Encoder.__init__(self, schema=state["header"], preset=state["config"])
+
+
+# Encoder of the current pool worker process, set by _init_worker
+_worker_encoder: Encoder | None = None
+
+
+def _init_worker(encoder: Encoder) -> None:
+    global _worker_encoder
+    _worker_encoder = encoder
+
+
+def _format_chunk(rows: list[dict] | Columns) -> list[str]:
+    assert _worker_encoder is not None
+    return list(_worker_encoder._iter_lines(rows))
+
+
+class ParallelEncoder(Encoder):
+    """Encoder that formats rows in a process pool.
+
+    Every worker receives the pickled header and Config once, then formats chunks of
+    `chunk_size` rows. Chunks are reassembled in order and repeated headers are
+    inserted by the parent, so output is identical to Encoder. Keep the encoder
+    around to reuse the pool, and close it (or use it as a context manager) when done.
+
+    Args:
+        sample: A list of dicts (or a single dict, or columnar data) to infer the header from
+        schema: A Schema, or an explicit header such as `Encoder(sample).header` of a previous encoder
+        workers: Number of worker processes (default: os.cpu_count())
+        chunk_size: Rows sent to a worker at a time
+        preset: Pre-configured Config (e.g., presets.markdown, presets.csv)
+        **overrides: Any Config field, as accepted by minemize()
+
+    Examples:
+        with ParallelEncoder(sample, workers=8) as encoder:
+            for export in exports:
+                fp.write(encoder.encode(export))
+    """
+
+    def __init__(
+        self,
+        sample: list | dict | Columns | None = None,
+        *,
+        schema: Iterable[HeaderElement] | None = None,
+        workers: int | None = None,
+        chunk_size: int = 1000,
+        preset: AnyConfig | None = None,
+        **overrides: Any,
+    ):
+        super().__init__(sample, schema=schema, preset=preset, **overrides)
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(Encoder(schema=self.header, preset=self.config),),
+        )
+
+    def _iter_lines(self, rows: Iterable[dict] | Columns) -> Iterator[str]:
+        # Keep a bounded number of chunks in flight so generators are not drained eagerly
+        pending: deque[Future[list[str]]] = deque()
+        for chunk in _iter_chunks(rows, self.chunk_size):
+            pending.append(self._pool.submit(_format_chunk, chunk))
+            if len(pending) > 2 * self.workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+    def close(self) -> None:
+        """Shut down the worker processes."""
+        self._pool.shutdown()
+
+    def __enter__(self) -> "ParallelEncoder":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def __getstate__(self) -> dict[str, Any]:
+        raise TypeError("ParallelEncoder owns a process pool and cannot be pickled")
+
+
+class IncrementalEncoder:
+    """Minemize a growing dataset, formatting only the rows added since the last call.
+
+    Keeps running schema statistics over every row appended so far. After each
+    append the header is rebuilt from those statistics (a cost proportional to the
+    schema, not the data); if a key crossed the sparsity threshold or a column
+    changed type, the new header is written before the new rows and used from then
+    on. Earlier output is never rewritten, and `header_repeat_interval` counts rows
+    across appends.
+
+    Unlike minemize(), the last row also has its trailing delimiters stripped, since
+    more rows may follow it. Only the running statistics and the current header are
+    kept, not the text returned, so memory does not grow with the output.
+
+    Args:
+        preset: Pre-configured Config (e.g., presets.markdown, presets.csv)
+        schema: A Schema to format every row with; the header then never changes
+        **overrides: Any Config field, as accepted by minemize(). With `schema_sample=N`
+            only the first N rows appended shape the header
+
+    Examples:
+        encoder = IncrementalEncoder(preset=presets.compact)
+        context = ""
+        for events in batches:
+            context += encoder.append(events)
+    """
+
+    def __init__(
+        self,
+        *,
+        preset: AnyConfig | None = None,
+        schema: Iterable[HeaderElement] | None = None,
+        **overrides: Any,
+    ):
+        cfg = self.config = _resolve_config(preset, overrides)
+        if cfg.schema_sample_mode != "head":
+            raise ValueError(f"schema_sample_mode={cfg.schema_sample_mode!r} needs all rows, appended rows are final")
+        self.rows = 0  # Rows appended so far
+        self._stats = _Stats()
+        self._fixed = schema is not None
+        self._encoder: Encoder | None = Encoder(schema=schema, preset=cfg) if schema is not None else None
+        self._since_header = 0  # Rows written since the last header
+        self._new_header = self._fixed
+
+    @property
+    def header(self) -> list[HeaderElement]:
+        """The header the latest rows were formatted with (empty before the first append without a schema)."""
+        return self._encoder.header if self._encoder is not None else []
+
+    def append(self, rows: Iterable[dict] | dict) -> str:
+        """Format new rows and return the text to add to the output so far.
+
+        The text starts with a newline unless it is the start of the output, so
+        `output += encoder.append(rows)` keeps a complete document.
+        """
+        rows = [rows] if isinstance(rows, dict) else list(rows)
+        if not rows:
+            return ""
+
+        cfg = self.config
+        sampled = rows if cfg.schema_sample is None else rows[: max(cfg.schema_sample - self.rows, 0)]
+        if not self._fixed and (sampled or self._encoder is None):
+            self._stats.add_values(sampled)
+            header = _build_header(self._stats, cfg)
+            if self._encoder is None or header != self._encoder.header:
+                # Schema drift: restart with a new header (written before the first new row)
+                self._encoder = Encoder(schema=header, preset=cfg)
+                self._new_header = True
+
+        encoder = self._encoder
+        assert encoder is not None  # Given a schema in __init__, else built on the first append
+        strip = encoder._strip
+        interval = cfg.header_repeat_interval
+        lines = []
+        for line in encoder._iter_lines(rows):
+            if self._new_header or (interval and self._since_header == interval):
+                lines.extend(encoder._header_lines)
+                self._new_header = False
+                self._since_header = 0
+            lines.append(_finish_line(line, strip, False))
+            self._since_header += 1
+
+        text = "\n".join(lines) if not self.rows else "\n" + "\n".join(lines)
+        self.rows += len(rows)
+        return text
+
+
 def minemize(
-    data: list | dict,
+    data: list | dict | Columns,
     *,
-    preset: Config | None = None,
+    preset: AnyConfig | None = None,
+    schema: Iterable[HeaderElement] | None = None,
     delimiter: str | None = _NOT_PROVIDED,
     use_spaces: bool | None = _NOT_PROVIDED,
     sparsity_threshold: float | None = _NOT_PROVIDED,
@@ -303,12 +1635,22 @@ def minemize(
     header_repeat_interval: int | None = _NOT_PROVIDED,
     row_prefix: str | None = _NOT_PROVIDED,
     schema_prefix: str | None = _NOT_PROVIDED,
+    schema_sample: int | None = _NOT_PROVIDED,
+    schema_sample_mode: str = _NOT_PROVIDED,
+    codegen: bool = _NOT_PROVIDED,
+    schema_cache: bool = _NOT_PROVIDED,
+    workers: int | None = None,
+    max_tokens: int | None = None,
+    token_counter: Callable[[str], int] | None = None,
+    max_chars: int | None = None,
 ) -> str:
     """Minimize your data into a compact string format.
 
     Args:
-        data: A list of dicts or a single dict to minemize
+        data: A list of dicts, a single dict, or columnar data (Columns, NumPy structured
+            array, pyarrow Table or RecordBatch) to minemize
         preset: Pre-configured Config (e.g., presets.markdown, presets.csv)
+        schema: A Schema to format with instead of inferring the header from data
         delimiter: Field separator (default: ";")
         use_spaces: Whether to use spaces around delimiters (default: True)
         sparsity_threshold: Frequency threshold for including keys in header (default: 0.5)
@@ -319,6 +1661,15 @@ def minemize(
         header_repeat_interval: Repeat header/schema every N data rows (default: None = no repeat)
         row_prefix: Prefix before each data row (e.g., "- ")
         schema_prefix: Prefix before header/schema lines (e.g., "> ")
+        schema_sample: Infer the header from at most N rows (default: None = all rows)
+        schema_sample_mode: How schema rows are sampled: "head", "stride" or "reservoir" (default: "head")
+        codegen: Compile nested column formatters into generated Python source (default: False)
+        schema_cache: Reuse the inferred header of structurally identical earlier inputs (default: False)
+        workers: Format rows in this many processes (default: None = in-process)
+        max_tokens: Keep only the leading rows that fit into this many tokens, header included
+            (needs token_counter; `Encoder(data).encode_budget()` also reports the rows kept)
+        token_counter: Returns the number of tokens in a string, e.g. `lambda s: len(enc.encode(s))`
+        max_chars: Keep only the leading rows that fit into this many characters
 
     Returns:
         str: The minemized representation
@@ -337,26 +1688,257 @@ def minemize(
 
         # Add prefixes for visual structure
         minemize(data, schema_prefix="> ", row_prefix="- ")
+
+        # Bound header inference on very large inputs
+        minemize(data, schema_sample=1000, schema_sample_mode="stride")
+
+        # Format a large export on 8 cores
+        minemize(data, workers=8)
+
+        # Column-oriented data, without building row dicts
+        minemize(Columns({"id": ids, "name": names}))
+
+        # As many rows as fit into 4000 tokens
+        minemize(data, max_tokens=4000, token_counter=lambda s: len(tokenizer.encode(s)))
+
+        # A fixed header, without inference
+        minemize(data, schema=Schema.from_type(Order))
     """
-    if isinstance(data, dict):
+    columns = _as_columns(data)
+    if columns is not None:
+        data = columns
+    elif isinstance(data, dict):
         data = [data]
-
-    if not data or not isinstance(data, list):
+    elif not isinstance(data, list):
+        return ""
+    if not len(data):
         return ""
 
-    # Start from preset or global config
-    base = preset if preset is not None else _global_config
-
-    cfg = base.derive(
-        delimiter=delimiter,
-        use_spaces=use_spaces,
-        sparsity_threshold=sparsity_threshold,
-        sparse_indicator=sparse_indicator,
-        header_separator=header_separator,
-        wrap_lines=wrap_lines,
-        common_optimizations=common_optimizations,
-        header_repeat_interval=header_repeat_interval,
-        row_prefix=row_prefix,
-        schema_prefix=schema_prefix,
+    overrides = {
+        "delimiter": delimiter,
+        "use_spaces": use_spaces,
+        "sparsity_threshold": sparsity_threshold,
+        "sparse_indicator": sparse_indicator,
+        "header_separator": header_separator,
+        "wrap_lines": wrap_lines,
+        "common_optimizations": common_optimizations,
+        "header_repeat_interval": header_repeat_interval,
+        "row_prefix": row_prefix,
+        "schema_prefix": schema_prefix,
+        "schema_sample": schema_sample,
+        "schema_sample_mode": schema_sample_mode,
+        "codegen": codegen,
+        "schema_cache": schema_cache,
+    }
+    cfg = _resolve_config(preset, overrides)
+    sample = data if schema is None else None
+    if max_tokens is not None or max_chars is not None:
+        encoder = Encoder(sample, schema=schema, preset=cfg)
+        return encoder.encode_budget(data, max_tokens=max_tokens, token_counter=token_counter, max_chars=max_chars).text
+    if workers and workers > 1:
+        with ParallelEncoder(sample, schema=schema, workers=workers, preset=cfg) as encoder:
+            return encoder.encode(data)
+    return Encoder(sample, schema=schema, preset=cfg).encode(data)
+
+
+def iter_minemize(
+    data: Iterable[dict] | dict | Columns,
+    *,
+    workers: int | None = None,
+    preset: AnyConfig | None = None,
+    schema: Iterable[HeaderElement] | None = None,
+    **overrides: Any,
+) -> Iterator[str]:
+    """Minemize rows lazily, yielding output lines (without newlines) as they are produced.
+
+    Accepts any iterable of dicts, including generators. `"\\n".join(iter_minemize(data))`
+    equals `minemize(data)` for lists. For other iterables the header is inferred from
+    the first `schema_sample` rows (default 1000), so memory stays constant regardless
+    of input size.
+
+    Args:
+        data: An iterable of dicts, a single dict, or columnar data (see minemize())
+        workers: Format rows in this many processes (default: None = in-process)
+        preset: Pre-configured Config (e.g., presets.markdown, presets.csv)
+        schema: A Schema to format with instead of inferring the header from data
+        **overrides: Any Config field, as accepted by minemize()
+
+    Examples:
+        with open("dump.jsonl") as src, open("out.txt", "w") as dst:
+            for line in iter_minemize(json.loads(row) for row in src):
+                dst.write(line + "\\n")
+    """
+    cfg = _resolve_config(preset, overrides)
+    sample, rows = _stream_source(data, cfg, schema)
+    if workers and workers > 1:
+        with ParallelEncoder(sample, schema=schema, workers=workers, preset=cfg) as encoder:
+            yield from encoder.iter_encode(rows)
+    else:
+        yield from Encoder(sample, schema=schema, preset=cfg).iter_encode(rows)
+
+
+def minemize_records(
+    data: Iterable[dict] | dict | Columns,
+    *,
+    workers: int | None = None,
+    preset: AnyConfig | None = None,
+    schema: Iterable[HeaderElement] | None = None,
+    **overrides: Any,
+) -> Records:
+    """Minemize records into one shared header block plus an individually addressable row per record.
+
+    For pipelines that store or embed each record separately: no document string is
+    built, so repeated headers and newlines inside values do not need to be split
+    apart afterwards (`header_repeat_interval` does not apply).
+
+    Args:
+        data: An iterable of dicts, a single dict, or columnar data (see minemize())
+        workers: Format rows in this many processes (default: None = in-process)
+        preset: Pre-configured Config (e.g., presets.markdown, presets.csv)
+        schema: A Schema to format with instead of inferring the header from data
+        **overrides: Any Config field, as accepted by minemize()
+
+    Examples:
+        records = minemize_records(products)
+        vectors = [embed(records.document(i)) for i in range(len(records))]
+    """
+    cfg = _resolve_config(preset, overrides)
+    sample, rows = _stream_source(data, cfg, schema)
+    if workers and workers > 1:
+        with ParallelEncoder(sample, schema=schema, workers=workers, preset=cfg) as encoder:
+            return encoder.encode_records(rows)
+    return Encoder(sample, schema=schema, preset=cfg).encode_records(rows)
+
+
+def minemize_chunks(
+    data: Iterable[dict] | dict | Columns,
+    *,
+    rows_per_chunk: int | None = None,
+    tokens_per_chunk: int | None = None,
+    token_counter: Callable[[str], int] | None = None,
+    workers: int | None = None,
+    preset: AnyConfig | None = None,
+    schema: Iterable[HeaderElement] | None = None,
+    **overrides: Any,
+) -> Iterator[str]:
+    """Split data into self-contained minemized chunks that share one header.
+
+    The header is inferred once for the whole input (from the first `schema_sample`
+    rows for one-shot iterables, as in iter_minemize()), and every chunk repeats it,
+    so chunks can be sent to separate LLM calls. Chunks are produced lazily.
+
+    Args:
+        data: An iterable of dicts, a single dict, or columnar data (see minemize())
+        rows_per_chunk: Put this many rows in each chunk
+        tokens_per_chunk: Fill each chunk with as many rows as fit into this many tokens
+        token_counter: Returns the number of tokens in a string (needed with tokens_per_chunk)
+        workers: Format rows in this many processes (default: None = in-process)
+        preset: Pre-configured Config (e.g., presets.markdown, presets.csv)
+        schema: A Schema to format with instead of inferring the header from data
+        **overrides: Any Config field, as accepted by minemize()
+
+    Examples:
+        prompts = [f"Summarize:\\n{chunk}" for chunk in minemize_chunks(data, rows_per_chunk=200)]
+    """
+    cfg = _resolve_config(preset, overrides)
+    sample, rows = _stream_source(data, cfg, schema)
+    chunks = {"rows_per_chunk": rows_per_chunk, "tokens_per_chunk": tokens_per_chunk, "token_counter": token_counter}
+    if workers and workers > 1:
+        with ParallelEncoder(
+            sample, schema=schema, workers=workers, chunk_size=rows_per_chunk or 1000, preset=cfg
+        ) as encoder:
+            yield from encoder.iter_chunks(rows, **chunks)
+    else:
+        yield from Encoder(sample, schema=schema, preset=cfg).iter_chunks(rows, **chunks)
+
+
+def minemize_to(
+    data: Iterable[dict] | dict | Columns,
+    fp: Any,
+    *,
+    flush_size: int = 65536,
+    encoding: str = "utf-8",
+    index: bool = False,
+    workers: int | None = None,
+    preset: AnyConfig | None = None,
+    schema: Iterable[HeaderElement] | None = None,
+    **overrides: Any,
+) -> RowIndex | None:
+    """Minemize data straight into a file-like object or socket.
+
+    Lines are buffered and written every `flush_size` characters, so the full
+    document is never built in memory. Writes exactly the text minemize() returns.
+
+    Args:
+        data: An iterable of dicts, a single dict, or columnar data (see iter_minemize())
+        fp: Text stream, binary stream or socket (anything with write() or sendall())
+        flush_size: Approximate number of characters buffered between writes
+        encoding: Encoding used for binary streams and sockets, and for index offsets
+        index: Also build a RowIndex of the byte offset of every row (text streams
+            must not translate newlines, e.g. open with `newline=""`)
+        workers: Format rows in this many processes (default: None = in-process)
+        preset: Pre-configured Config (e.g., presets.markdown, presets.csv)
+        schema: A Schema to format with instead of inferring the header from data
+        **overrides: Any Config field, as accepted by minemize()
+
+    Returns:
+        The RowIndex if index is true, else None
+
+    Examples:
+        with open("out.txt", "wb") as fp:
+            minemize_to(rows, fp, preset=presets.compact)
+    """
+    write = _text_writer(fp, encoding)
+    if not index:
+        lines = iter_minemize(data, workers=workers, preset=preset, schema=schema, **overrides)
+        _write_lines(lines, write, flush_size)
+        return None
+
+    cfg = _resolve_config(preset, overrides)
+    sample, rows = _stream_source(data, cfg, schema)
+    encoder = (
+        ParallelEncoder(sample, schema=schema, workers=workers, preset=cfg)
+        if workers and workers > 1
+        else Encoder(sample, schema=schema, preset=cfg)
     )
-    return _serialize(data, cfg)
+    header_lines = encoder._header_lines
+    header = "\n".join(header_lines) + "\n"
+    header_size = len(header) if header.isascii() else len(header.encode(encoding))
+    offsets = array("Q")
+
+    def indexed_lines() -> Iterator[str]:
+        position = 0
+        for after_header, line in encoder._iter_rows(rows):
+            if after_header:
+                yield from header_lines
+                position += header_size
+                offsets.append(position | RowIndex.HEADER)
+            else:
+                offsets.append(position)
+            yield line
+            position += (len(line) if line.isascii() else len(line.encode(encoding))) + 1
+        offsets.append(position)
+
+    try:
+        _write_lines(indexed_lines(), write, flush_size)
+    finally:
+        if isinstance(encoder, ParallelEncoder):
+            encoder.close()
+    return RowIndex(offsets, header_size)
+
+
+def _write_lines(lines: Iterable[str], write: Callable[[str], Any], flush_size: int) -> None:
+    """Write lines joined by newlines, in writes of about flush_size characters."""
+    pending: list[str] = []
+    size = 0
+    separator = ""
+    for line in lines:
+        pending.append(line)
+        size += len(line) + 1
+        if size >= flush_size:
+            write(separator + "\n".join(pending))
+            separator = "\n"
+            pending.clear()
+            size = 0
+    if pending:
+        write(separator + "\n".join(pending))
@@ -0,0 +1,357 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Parse minemized text back into rows: the inverse of minemize()."""
+
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+from minemizer.config import AnyConfig, FrozenConfig
+from minemizer.core import HeaderElement, _resolve_config
+
+_VALUE = HeaderElement.VALUE
+_DICT = HeaderElement.DICT
+_LIST = HeaderElement.LIST
+_DICT_LIST = HeaderElement.DICT_LIST
+
+_CONSTANTS: dict[str, Any] = {"": None, "true": True, "false": False}
+
+
+def _scalar(text: str) -> Any:
+    """Convert a value back to None, a bool, an int, a float or a string.
+
+    Only the spellings str() produces count as numbers, so "007" or "1.50" stay strings.
+    """
+    if text in _CONSTANTS:
+        return _CONSTANTS[text]
+    c = text[1:2] if text[0] == "-" else text[0]
+    if "0" <= c <= "9":
+        try:
+            value: int | float = int(text)
+        except ValueError:
+            try:
+                value = float(text)
+            except ValueError:
+                return text
+        if str(value) == text:
+            return value
+    return text
+
+
+class _Decoder:
+    """Single-pass parser for the lines of one minemized document.
+
+    Values are scanned left to right once, guided by the header: str.find() jumps
+    to the next delimiter or closing bracket, and rows without brackets under a
+    flat header are split in one call.
+    """
+
+    def __init__(self, cfg: FrozenConfig):
+        self.config = cfg
+        self.header: list[HeaderElement] | None = None
+        self._header_text: str | None = None
+        self._names: tuple[str, ...] = ()
+        self._flat = True
+        self._delimiter = cfg.delimiter
+        self._spaces = cfg.use_spaces
+
+    def iter_rows(self, lines: Iterable[str]) -> Iterator[dict]:
+        """Yield the rows of a document's lines, reading (and re-reading) headers on the way."""
+        cfg = self.config
+        wrap = cfg.wrap_lines
+        schema_prefix = cfg.schema_prefix or ""
+        row_prefix = cfg.row_prefix
+        interval = cfg.header_repeat_interval
+        separator_pending = False
+        since_header = 0  # Rows read since the last header
+        for number, line in enumerate(lines, 1):
+            if wrap and len(line) >= 2 * len(wrap) and line.startswith(wrap) and line.endswith(wrap):
+                line = line[len(wrap) : -len(wrap)]
+            if separator_pending:
+                separator_pending = False
+                continue
+            prefixed = bool(schema_prefix) and line.startswith(schema_prefix)
+            # A repeated header is expected by position only: a row may read exactly like it
+            if self.header is None or prefixed or (since_header == interval and line == self._header_text):
+                if line != self._header_text:
+                    self._set_header(line[len(schema_prefix) :] if prefixed else line, number)
+                    self._header_text = line
+                separator_pending = bool(cfg.header_separator)
+                since_header = 0
+                continue
+            since_header += 1
+            if row_prefix and line.startswith(row_prefix):
+                line = line[len(row_prefix) :]
+            try:
+                yield self._row(line)
+            except ValueError as exc:
+                raise ValueError(f"Line {number}: {exc}") from None
+
+    # --- Header ---
+
+    def _set_header(self, text: str, number: int) -> None:
+        try:
+            header, _, _ = self._elements(text, 0, "")
+        except ValueError as exc:
+            raise ValueError(f"Line {number}: {exc}") from None
+        self.header = header
+        self._names = tuple(el.name for el in header)
+        self._flat = all(el.kind == _VALUE for el in header)
+
+    def _elements(self, s: str, pos: int, closer: str) -> tuple[list[HeaderElement], bool, int]:
+        """Parse header elements up to closer (or the end of the line when closer is "")."""
+        elements: list[HeaderElement] = []
+        has_sparse = False
+        d = self._delimiter
+        n = len(s)
+        pos = self._skip(s, pos)
+        if closer and s.startswith(closer, pos):
+            return elements, has_sparse, pos + 1
+        if pos >= n and not closer:
+            return elements, has_sparse, pos
+        while True:
+            pos = self._skip(s, pos)
+            start = pos
+            while pos < n and s[pos] not in "{[" and s[pos] != closer and not s.startswith(d, pos):
+                pos += 1
+            name = s[start:pos].rstrip(" ") if self._spaces else s[start:pos]
+            c = s[pos] if pos < n else ""
+            if c == "{":
+                schema, sparse, pos = self._elements(s, pos + 1, "}")
+                elements.append(HeaderElement(name, _DICT, tuple(schema), sparse))
+            elif c == "[":
+                pos = self._skip(s, pos + 1)
+                if s.startswith("]", pos):
+                    elements.append(HeaderElement(name, _LIST))
+                    pos += 1
+                elif s.startswith("{", pos):
+                    schema, sparse, pos = self._elements(s, pos + 1, "}")
+                    pos = self._expect(s, self._skip(s, pos), "]")
+                    elements.append(HeaderElement(name, _DICT_LIST, tuple(schema), sparse))
+                else:
+                    raise ValueError(f"expected '{{' or ']' at position {pos}: {s!r}")
+            elif closer and name == self.config.sparse_indicator:
+                has_sparse = True
+            else:
+                elements.append(HeaderElement(name))
+            pos = self._skip(s, pos)
+            if pos >= n and not closer:
+                return elements, has_sparse, pos
+            if s.startswith(d, pos):
+                pos += len(d)
+                continue
+            return elements, has_sparse, self._expect(s, pos, closer)
+
+    # --- Rows ---
+
+    def _row(self, s: str) -> dict:
+        header = self.header or []
+        if self._flat and "{" not in s and "[" not in s:
+            return self._flat_row(s)
+        row: dict = {}
+        if not s and not header:
+            return row
+        d = self._delimiter
+        n = len(s)
+        pos = 0
+        i = 0
+        while True:
+            if i < len(header):
+                el = header[i]
+                row[el.name], pos = self._value(s, pos, el, "")
+            else:
+                key, value, pos = self._pair(s, pos, "")
+                row[key] = None if value == "None" else value  # Sparse None is printed as "None"
+            i += 1
+            pos = self._skip(s, pos)
+            if pos >= n:
+                break
+            if not s.startswith(d, pos):
+                raise ValueError(f"expected {d!r} at position {pos}: {s!r}")
+            pos = self._skip(s, pos + len(d))
+            if pos >= n and i >= len(header):
+                break
+        for el in header[i:]:
+            row[el.name] = None
+        return row
+
+    def _flat_row(self, s: str) -> dict:
+        """_row() for a flat header and a row without brackets: one split, no scanning."""
+        names = self._names
+        parts = s.split(self._delimiter)
+        if self._spaces:
+            parts = [part.strip(" ") for part in parts]
+        row = {name: _scalar(part) for name, part in zip(names, parts, strict=False)}
+        if len(parts) < len(names):
+            for name in names[len(parts) :]:
+                row[name] = None
+            return row
+        for part in parts[len(names) :]:
+            if not part:
+                continue  # Trailing delimiter
+            key, sep, value = part.partition(":")
+            if not sep:
+                raise ValueError(f"expected 'key: value', got {part!r}")
+            value = value.lstrip(" ")
+            row[key] = None if value == "None" else _scalar(value)
+        return row
+
+    def _value(self, s: str, pos: int, el: HeaderElement | None, closer: str) -> tuple[Any, int]:
+        """Parse one value at pos, ending at a delimiter or closer; el gives dicts a schema."""
+        pos = self._skip(s, pos)
+        c = s[pos] if pos < len(s) else ""
+        if c == "{":
+            return self._dict(s, pos + 1, el if el is not None and el.kind == _DICT else None)
+        if c == "[":
+            return self._list(s, pos + 1, el if el is not None and el.kind == _DICT_LIST else None)
+        end = s.find(self._delimiter, pos)
+        if closer:
+            stop = s.find(closer, pos)
+            if stop != -1 and (end == -1 or stop < end):
+                end = stop
+        if end == -1:
+            end = len(s)
+        text = s[pos:end]
+        return _scalar(text.rstrip(" ") if self._spaces else text), end
+
+    def _dict(self, s: str, pos: int, el: HeaderElement | None) -> tuple[dict, int]:
+        """Parse a dict after its "{": positional schema values, then `key: value` pairs."""
+        out: dict = {}
+        pos = self._skip(s, pos)
+        if s.startswith("}", pos):
+            return out, pos + 1
+        schema = el.schema if el is not None else ()
+        d = self._delimiter
+        i = 0
+        while True:
+            if i < len(schema):
+                child = schema[i]
+                out[child.name], pos = self._value(s, pos, child, "}")
+            else:
+                key, out[key], pos = self._pair(s, pos, "}")
+            i += 1
+            pos = self._skip(s, pos)
+            if s.startswith(d, pos):
+                pos += len(d)
+                continue
+            pos = self._expect(s, pos, "}")
+            for child in schema[i:]:
+                out[child.name] = None
+            return out, pos
+
+    def _list(self, s: str, pos: int, el: HeaderElement | None) -> tuple[list, int]:
+        """Parse a list after its "["; with el, dict items use its schema."""
+        out: list = []
+        pos = self._skip(s, pos)
+        if s.startswith("]", pos):
+            return out, pos + 1
+        d = self._delimiter
+        while True:
+            pos = self._skip(s, pos)
+            if el is not None and s.startswith("{", pos):
+                item, pos = self._dict(s, pos + 1, el)
+            else:
+                item, pos = self._value(s, pos, None, "]")
+            out.append(item)
+            pos = self._skip(s, pos)
+            if s.startswith(d, pos):
+                pos += len(d)
+                continue
+            return out, self._expect(s, pos, "]")
+
+    def _pair(self, s: str, pos: int, closer: str) -> tuple[str, Any, int]:
+        """Parse `key: value`, `key{ ...}` or `key[ ...]`."""
+        pos = self._skip(s, pos)
+        start = pos
+        n = len(s)
+        d = self._delimiter
+        while pos < n:
+            c = s[pos]
+            if c == ":":
+                key = s[start:pos]
+                value, pos = self._value(s, pos + 1, None, closer)
+                return key, value, pos
+            if c == "{" or c == "[":
+                key = s[start:pos]
+                value, pos = self._dict(s, pos + 1, None) if c == "{" else self._list(s, pos + 1, None)
+                return key, value, pos
+            if c == closer or s.startswith(d, pos):
+                break
+            pos += 1
+        raise ValueError(f"expected 'key: value' at position {start}: {s!r}")
+
+    # --- Scanning helpers ---
+
+    def _skip(self, s: str, pos: int) -> int:
+        if self._spaces:
+            n = len(s)
+            while pos < n and s[pos] == " ":
+                pos += 1
+        return pos
+
+    @staticmethod
+    def _expect(s: str, pos: int, token: str) -> int:
+        if not s.startswith(token, pos):
+            raise ValueError(f"expected {token!r} at position {pos}: {s!r}")
+        return pos + len(token)
+
+
+def iter_unminemize(
+    data: str | Iterable[str],
+    *,
+    preset: AnyConfig | None = None,
+    **overrides: Any,
+) -> Iterator[dict]:
+    """Parse minemized text back into dicts, yielding one row at a time.
+
+    Pass the preset and overrides the text was minemized with. `data` is the whole
+    text or any iterable of lines (an open file, iter_minemize() output); trailing
+    newlines are dropped, so a large file is decoded without reading it whole.
+
+    Headers repeated every header_repeat_interval rows are skipped, so pass the
+    interval the text was written with; rows that merely read like the header stay
+    rows. With a schema_prefix every prefixed line is a header, so a new header
+    (e.g. after IncrementalEncoder schema drift) applies to the rows below it.
+
+    Values come back as None, bools, ints, floats (in the spelling str() gives them),
+    lists, dicts or strings. The format has no escaping, so values containing
+    delimiters, brackets or newlines, and the difference between a missing key and
+    None, do not survive a round trip.
+
+    Args:
+        data: Minemized text, or an iterable of its lines
+        preset: Pre-configured Config the text was written with (e.g., presets.markdown)
+        **overrides: Any Config field, as passed to minemize()
+
+    Raises:
+        ValueError: On a line that is not valid for the header, with its line number
+
+    Examples:
+        with open("rows.txt") as f:
+            for row in iter_unminemize(f, preset=presets.compact):
+                ...
+    """
+    cfg = _resolve_config(preset, overrides)
+    if isinstance(data, str):
+        lines: Iterable[str] = data.split("\n") if data else ()
+    else:
+        lines = (line[:-1] if line.endswith("\n") else line for line in data)
+    return _Decoder(cfg).iter_rows(lines)
+
+
+def unminemize(
+    data: str | Iterable[str],
+    *,
+    preset: AnyConfig | None = None,
+    **overrides: Any,
+) -> list[dict]:
+    """Parse minemized text back into a list of dicts.
+
+    See iter_unminemize() for the arguments and what survives a round trip.
+
+    Examples:
+        >>> unminemize("id; name\\n1; Alice\\n2; Bob")
+        [{'id': 1, 'name': 'Alice'}, {'id': 2, 'name': 'Bob'}]
+    """
+    return list(iter_unminemize(data, preset=preset, **overrides))
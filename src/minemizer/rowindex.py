@@ -0,0 +1,89 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Byte-offset index of the rows of a minemized file (minemize_to(..., index=True))."""
+
+from array import array
+from typing import Any
+
+# Format version of RowIndex.dump()
+_INDEX_VERSION = 1
+
+
+class RowIndex:
+    """Start offsets of every row in a minemized file, for slicing rows without parsing.
+
+    `offsets[i]` is the byte offset where row `i` starts, with the `HEADER` bit set
+    when a header block (the header line, plus separator if any) directly precedes
+    the row. A final entry points one past the end of the last row. Every header
+    block is the same `header_size` bytes and the first one starts the file, so any
+    row range can be served from a memory-mapped file with two lookups.
+
+    Examples:
+        index = minemize_to(rows, fp, index=True)
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+            prompt = index.read(m, 1000, 1200).decode()
+    """
+
+    __slots__ = ("offsets", "header_size")
+
+    HEADER = 1 << 63
+    _MASK = HEADER - 1
+
+    def __init__(self, offsets: array, header_size: int):
+        self.offsets = offsets
+        self.header_size = header_size  # Bytes of one header block, including its newline
+
+    def __len__(self) -> int:
+        return max(len(self.offsets) - 1, 0)
+
+    def __repr__(self) -> str:
+        return f"RowIndex(rows={len(self)}, header_size={self.header_size})"
+
+    def start(self, row: int) -> int:
+        """Byte offset where a row starts."""
+        return self.offsets[row] & self._MASK
+
+    def after_header(self, row: int) -> bool:
+        """Whether a header block directly precedes a row."""
+        return bool(self.offsets[row] & self.HEADER)
+
+    def span(self, start: int, stop: int) -> tuple[int, int]:
+        """Byte range [begin, end) of rows start..stop-1, without the trailing newline.
+
+        Headers repeated between the rows are part of the range.
+        """
+        stop = min(stop, len(self))
+        if start >= stop:
+            return 0, 0
+        end = self.offsets[stop]
+        gap = self.header_size if end & self.HEADER else 0
+        return self.start(start), (end & self._MASK) - 1 - gap
+
+    def read(self, buffer: Any, start: int, stop: int) -> bytes:
+        """Return rows start..stop-1 of a file's contents as a document with the header.
+
+        `buffer` is anything sliceable into bytes: an mmap, bytes or memoryview.
+        """
+        if start >= min(stop, len(self)):
+            return b""
+        begin, end = self.span(start, stop)
+        return bytes(buffer[: self.header_size]) + bytes(buffer[begin:end])
+
+    def dump(self, fp: Any) -> None:
+        """Write the index to a binary stream (native byte order, like array.tofile())."""
+        fp.write(array("Q", [_INDEX_VERSION, self.header_size, len(self.offsets)]).tobytes())
+        fp.write(self.offsets.tobytes())
+
+    @classmethod
+    def load(cls, fp: Any) -> "RowIndex":
+        """Read an index written by dump()."""
+        meta = array("Q")
+        meta.frombytes(fp.read(3 * meta.itemsize))
+        version, header_size, count = meta
+        if version != _INDEX_VERSION:
+            raise ValueError(f"Unsupported RowIndex version: {version}")
+        offsets = array("Q")
+        offsets.frombytes(fp.read(count * offsets.itemsize))
+        return cls(offsets, header_size)
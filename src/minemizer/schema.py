@@ -0,0 +1,357 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Explicit schemas: a fixed header instead of one inferred from the data."""
+
+import dataclasses
+import json
+import types
+import typing
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from typing import Any
+
+from minemizer.columnar import Columns
+from minemizer.config import AnyConfig, Config, FrozenConfig
+from minemizer.core import Encoder, HeaderElement, _resolve_config
+
+_DICT = HeaderElement.DICT
+_LIST = HeaderElement.LIST
+_DICT_LIST = HeaderElement.DICT_LIST
+
+
+class Schema(Sequence[HeaderElement]):
+    """A fixed header, used as is instead of inferring one from every input.
+
+    With a schema, minemize() and the streaming APIs skip header inference: output
+    is pure formatting, and the header stays the same from batch to batch. Row keys
+    missing from the schema are written as sparse `key: value` fields; keys of a
+    nested dict missing from its schema are only kept when it allows sparse keys.
+
+    Build one from a nested spec, where each key maps to its kind of value:
+
+        Schema({
+            "id": int,                              # any non-dict, non-list value
+            "contact": {"email": str, ...: ...},    # dict; an `...` key allows sparse keys
+            "tags": list,                           # list of values (or [])
+            "orders": [{"sku": str, "qty": int}],   # list of dicts
+            "meta": dict,                           # dict with only sparse keys (or {})
+        })
+
+    or with from_type() (dataclass, TypedDict, Pydantic model), from_json_schema(),
+    parse() (header text) or infer() (sample data). A Schema is a sequence of
+    HeaderElements, so `Schema(encoder.header)` works too.
+
+    `config` optionally records the (frozen) Config the schema was built for;
+    infer() and parse() set it. It is saved by dumps() and restored by loads(), but
+    not applied automatically: pass `preset=schema.config` to use it. Equality and
+    hashing only look at the header.
+
+    Examples:
+        schema = Schema.from_type(Order)
+        for batch in batches:
+            send(minemize(batch, schema=schema))
+    """
+
+    __slots__ = ("elements", "config")
+
+    def __init__(
+        self,
+        spec: Mapping[Any, Any] | Iterable[HeaderElement | str],
+        config: AnyConfig | None = None,
+    ):
+        if isinstance(spec, Mapping):
+            elements = _spec_elements(spec)[0]
+        else:
+            elements = [HeaderElement(el) if isinstance(el, str) else el for el in spec]
+        self.elements: tuple[HeaderElement, ...] = tuple(elements)
+        self.config = config.freeze() if config is not None else None
+
+    @classmethod
+    def from_type(cls, tp: type) -> "Schema":
+        """Build a schema from the fields of a dataclass, TypedDict or Pydantic model.
+
+        Nested records become nested dicts, `list[Record]` a list of dicts, other
+        lists, tuples and sets a list, `dict[...]` a dict of sparse keys, and
+        `Optional[X]` is treated as X. Anything else is a plain value.
+        """
+        if not _is_record(tp):
+            raise TypeError(f"Expected a dataclass, TypedDict or Pydantic model, got {tp!r}")
+        return cls(_record_elements(tp, frozenset()))
+
+    @classmethod
+    def from_json_schema(cls, description: Mapping[str, Any] | str) -> "Schema":
+        """Build a schema from a JSON Schema object description (a dict or JSON text).
+
+        Objects with `properties` become nested dicts (allowing sparse keys when
+        `additionalProperties` is set to true or a schema), objects without become
+        dicts of sparse keys, and arrays of objects become lists of dicts. Local
+        `$ref`s (e.g. `#/$defs/Item`, as written by Pydantic) and nullable `anyOf`
+        are followed.
+        """
+        root = json.loads(description) if isinstance(description, str) else description
+        resolved, refs = _resolve_json(root, root, frozenset())
+        if resolved is None or "properties" not in resolved:
+            raise ValueError("JSON Schema description must be an object with properties")
+        return cls(_json_elements(resolved, root, refs)[0])
+
+    @classmethod
+    def parse(cls, header: str, *, preset: AnyConfig | None = None, **overrides: Any) -> "Schema":
+        """Build a schema from a header line, e.g. `"id; name; contact{ email; ...}"`.
+
+        The header is read with the given preset and overrides, as by unminemize().
+        """
+        from minemizer.decoder import _Decoder
+
+        decoder = _Decoder(_resolve_config(preset, overrides))
+        decoder._set_header(header, 1)
+        return cls(decoder.header or (), decoder.config)
+
+    @classmethod
+    def infer(cls, sample: list | dict | Columns, *, preset: AnyConfig | None = None, **overrides: Any) -> "Schema":
+        """Infer a schema from sample data once, as minemize() would, to reuse it for later inputs."""
+        encoder = Encoder(sample, preset=preset, **overrides)
+        return cls(encoder.header, encoder.config)
+
+    def dumps(self) -> str:
+        """Serialize the header and config to compact JSON, for loads().
+
+        Plain values are stored as their name and other elements as
+        `[name, kind, children, has_sparse]`, next to a format version and every
+        Config field (so a later change of defaults does not change the output).
+        """
+        document = {
+            "version": _SCHEMA_VERSION,
+            "config": _config_fields(self.config) if self.config is not None else None,
+            "header": [_element_to_json(el) for el in self.elements],
+        }
+        return json.dumps(document, separators=(",", ":"), ensure_ascii=False)
+
+    @classmethod
+    def loads(cls, text: str | bytes) -> "Schema":
+        """Load a schema written by dumps(), with its config."""
+        document = json.loads(text)
+        version = document.get("version") if isinstance(document, dict) else None
+        if version != _SCHEMA_VERSION:
+            raise ValueError(f"Unsupported Schema version: {version}")
+        fields = document["config"]
+        config = _config_from_fields(fields) if fields is not None else None
+        return cls([_element_from_json(item) for item in document["header"]], config)
+
+    def dump(self, fp: Any) -> None:
+        """Write dumps() to a text stream."""
+        fp.write(self.dumps())
+
+    @classmethod
+    def load(cls, fp: Any) -> "Schema":
+        """Read a schema written by dump() from a text or binary stream."""
+        return cls.loads(fp.read())
+
+    def to_string(self, cfg: AnyConfig | None = None) -> str:
+        """The header line for a config (default: the global config), without prefix or wrapping."""
+        cfg = _resolve_config(cfg, {})
+        return cfg.cleanup(cfg.spaced_delimiter.join(el.to_string(cfg) for el in self.elements))
+
+    def __len__(self) -> int:
+        return len(self.elements)
+
+    @typing.overload
+    def __getitem__(self, index: int) -> HeaderElement: ...
+
+    @typing.overload
+    def __getitem__(self, index: slice) -> tuple[HeaderElement, ...]: ...
+
+    def __getitem__(self, index: int | slice) -> HeaderElement | tuple[HeaderElement, ...]:
+        return self.elements[index]
+
+    def __iter__(self) -> Iterator[HeaderElement]:
+        return iter(self.elements)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Schema):
+            return NotImplemented
+        return self.elements == other.elements
+
+    def __hash__(self) -> int:
+        return hash(self.elements)
+
+    def __reduce__(self) -> tuple:
+        return Schema, (self.elements, self.config)
+
+    def __repr__(self) -> str:
+        return f"Schema({self.to_string(Config().freeze())!r})"
+
+
+# --- Persistence ---
+
+# Format version of Schema.dumps()
+_SCHEMA_VERSION = 1
+
+_CONFIG_FIELDS = tuple(f.name for f in dataclasses.fields(Config))
+
+
+def _config_fields(cfg: FrozenConfig) -> dict[str, Any]:
+    return {name: getattr(cfg, name) for name in _CONFIG_FIELDS}
+
+
+def _config_from_fields(fields: Mapping[str, Any]) -> FrozenConfig:
+    unknown = set(fields) - set(_CONFIG_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown Config fields: {sorted(unknown)}")
+    return Config(**fields).freeze()
+
+
+def _element_to_json(el: HeaderElement) -> Any:
+    if el.kind == HeaderElement.VALUE:
+        return el.name
+    return [el.name, el.kind, [_element_to_json(child) for child in el.schema], int(el.has_sparse)]
+
+
+def _element_from_json(item: Any) -> HeaderElement:
+    if not isinstance(item, list):
+        return HeaderElement(item)
+    name, kind, schema, has_sparse = item
+    if kind not in (_DICT, _LIST, _DICT_LIST):
+        raise ValueError(f"Unknown HeaderElement kind: {kind!r}")
+    return HeaderElement(name, kind, [_element_from_json(child) for child in schema], bool(has_sparse))
+
+
+# --- Nested spec ---
+
+
+def _spec_elements(spec: Mapping[Any, Any]) -> tuple[list[HeaderElement], bool]:
+    """Elements of a nested spec dict, and whether it has an `...` (sparse keys) entry."""
+    elements = []
+    has_sparse = False
+    for name, value in spec.items():
+        if name is Ellipsis:
+            has_sparse = True
+        else:
+            elements.append(_spec_element(name, value))
+    return elements, has_sparse
+
+
+def _spec_element(name: str, value: Any) -> HeaderElement:
+    if isinstance(value, Mapping):
+        schema, has_sparse = _spec_elements(value)
+        return HeaderElement(name, _DICT, schema, has_sparse or not schema)
+    if value is dict:
+        return HeaderElement(name, _DICT, (), True)
+    if value is list or (isinstance(value, list) and not value):
+        return HeaderElement(name, _LIST)
+    if isinstance(value, list):
+        if len(value) != 1 or not isinstance(value[0], Mapping):
+            raise ValueError(f"List spec for {name!r} must be empty or hold one dict spec, got {value!r}")
+        schema, has_sparse = _spec_elements(value[0])
+        return HeaderElement(name, _DICT_LIST, schema, has_sparse or not schema)
+    return HeaderElement(name)
+
+
+# --- Dataclasses, TypedDicts and Pydantic models ---
+
+
+def _is_record(tp: Any) -> bool:
+    return isinstance(tp, type) and (
+        dataclasses.is_dataclass(tp) or typing.is_typeddict(tp) or hasattr(tp, "model_fields")
+    )
+
+
+def _record_elements(tp: type, seen: frozenset[type]) -> list[HeaderElement]:
+    hints = typing.get_type_hints(tp)
+    if dataclasses.is_dataclass(tp):
+        names: Iterable[str] = [f.name for f in dataclasses.fields(tp)]
+    elif hasattr(tp, "model_fields"):
+        names = tp.model_fields
+    else:
+        names = hints
+    seen = seen | {tp}
+    return [_type_element(name, hints[name], seen) for name in names]
+
+
+def _type_element(name: str, tp: Any, seen: frozenset[type]) -> HeaderElement:
+    tp = _unwrap_optional(tp)
+    origin = typing.get_origin(tp) or tp
+    if _is_record(tp):
+        if tp in seen:  # Recursive type: its keys are written as sparse pairs
+            return HeaderElement(name, _DICT, (), True)
+        return HeaderElement(name, _DICT, _record_elements(tp, seen))
+    if origin is dict or (isinstance(origin, type) and issubclass(origin, Mapping)):
+        return HeaderElement(name, _DICT, (), True)
+    if origin in (list, tuple, set, frozenset, Sequence):
+        args = typing.get_args(tp)
+        homogeneous = len(args) == 1 or (len(args) == 2 and args[1] is Ellipsis)
+        return _list_element(name, _type_element(name, args[0], seen) if homogeneous else None)
+    return HeaderElement(name)
+
+
+def _unwrap_optional(tp: Any) -> Any:
+    """X for Optional[X] (and Annotated[X, ...]), tp itself for anything else."""
+    origin = typing.get_origin(tp)
+    if origin is typing.Annotated:
+        return _unwrap_optional(typing.get_args(tp)[0])
+    if origin is typing.Union or origin is types.UnionType:
+        args = [arg for arg in typing.get_args(tp) if arg is not type(None)]
+        if len(args) == 1:
+            return _unwrap_optional(args[0])
+    return tp
+
+
+# --- JSON Schema ---
+
+
+def _resolve_json(
+    node: Mapping[str, Any], root: Mapping[str, Any], refs: frozenset[str]
+) -> tuple[Mapping[str, Any] | None, frozenset[str]]:
+    """Follow local $refs and unwrap a nullable anyOf/oneOf, adding the refs followed to refs.
+
+    The node is None when a $ref leads back to one of refs (a recursive definition).
+    """
+    while True:
+        ref = node.get("$ref")
+        if isinstance(ref, str):
+            if ref in refs:
+                return None, refs
+            if not ref.startswith("#/"):
+                return {}, refs
+            refs = refs | {ref}
+            target: Any = root
+            for part in ref[2:].split("/"):
+                target = target.get(part.replace("~1", "/").replace("~0", "~"), {})
+            node = target
+            continue
+        for combinator in ("anyOf", "oneOf"):
+            options = [option for option in node.get(combinator, ()) if option.get("type") != "null"]
+            if len(options) == 1:
+                node = options[0]
+                break
+        else:
+            return node, refs
+
+
+def _json_elements(node: Mapping[str, Any], root: Mapping[str, Any], refs: frozenset[str]) -> tuple[list, bool]:
+    """Elements for an object's properties, and whether it allows sparse keys."""
+    properties = node.get("properties") or {}
+    additional = node.get("additionalProperties")
+    has_sparse = not properties or additional is True or isinstance(additional, Mapping)
+    return [_json_element(name, prop, root, refs) for name, prop in properties.items()], has_sparse
+
+
+def _json_element(name: str, node: Mapping[str, Any], root: Mapping[str, Any], refs: frozenset[str]) -> HeaderElement:
+    resolved, refs = _resolve_json(node, root, refs)
+    if resolved is None:  # Recursive definition: its keys are written as sparse pairs
+        return HeaderElement(name, _DICT, (), True)
+    node = resolved
+    if node.get("type") == "object" or "properties" in node:
+        schema, has_sparse = _json_elements(node, root, refs)
+        return HeaderElement(name, _DICT, schema, has_sparse)
+    if node.get("type") == "array":
+        items = node.get("items")
+        return _list_element(name, _json_element(name, items, root, refs) if isinstance(items, Mapping) else None)
+    return HeaderElement(name)
+
+
+def _list_element(name: str, item: HeaderElement | None) -> HeaderElement:
+    """A list of dicts if its items are dicts, else a plain list."""
+    if item is not None and item.kind == _DICT:
+        return HeaderElement(name, _DICT_LIST, item.schema, item.has_sparse)
+    return HeaderElement(name, _LIST)
@@ -0,0 +1,77 @@
+"""Tests for the asyncio API."""
+
+import asyncio
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest
+
+from minemizer import minemize, presets
+from minemizer.aio import aiter_minemize, aminemize
+
+ROWS = [{"id": i, "name": f"user{i}", "meta": {"n": i % 3} if i % 2 else None} for i in range(57)]
+
+
+async def agen(rows):
+    for row in rows:
+        await asyncio.sleep(0)
+        yield row
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+@pytest.mark.parametrize("preset", [None, presets.markdown, presets.compact])
+@pytest.mark.parametrize("chunk_size", [1, 10, 1000])
+def test_aminemize_matches_minemize(preset, chunk_size):
+    """Async input gives the same text as minemize(), including repeated headers."""
+    kwargs = {"preset": preset, "header_repeat_interval": 10}
+    expected = minemize(ROWS, **kwargs)
+    assert run(aminemize(agen(ROWS), chunk_size=chunk_size, **kwargs)) == expected
+    assert run(aminemize(ROWS, chunk_size=chunk_size, **kwargs)) == expected
+
+
+def test_aiter_minemize_yields_lines():
+    """Lines are yielded one by one, like iter_minemize()."""
+
+    async def collect():
+        return [line async for line in aiter_minemize(agen(ROWS[:3]))]
+
+    assert run(collect()) == minemize(ROWS[:3]).split("\n")
+
+
+@pytest.mark.parametrize("executor_type", [ThreadPoolExecutor, ProcessPoolExecutor])
+def test_executor_formatting(executor_type):
+    """Chunks formatted in an executor come back in order."""
+    with executor_type(max_workers=2) as executor:
+        text = run(aminemize(agen(ROWS), executor=executor, chunk_size=7, schema_sample=20))
+    assert text == minemize(ROWS, schema_sample=20)
+
+
+def test_event_loop_stays_responsive():
+    """Other tasks run while a large input is formatted."""
+    rows = [{"id": i, "name": f"user{i}"} for i in range(20_000)]
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0)
+
+    async def main():
+        task = asyncio.create_task(ticker())
+        text = await aminemize(rows, chunk_size=500)
+        task.cancel()
+        return text
+
+    assert run(main()) == minemize(rows)
+    assert ticks >= 20_000 // 500
+
+
+def test_async_edge_cases():
+    """Empty inputs, single dicts and unsupported sampling."""
+    assert run(aminemize(agen([]))) == ""
+    assert run(aminemize({"a": 1})) == minemize({"a": 1})
+    with pytest.raises(ValueError):
+        run(aminemize(agen(ROWS), schema_sample=5, schema_sample_mode="stride"))
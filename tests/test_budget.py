@@ -0,0 +1,79 @@
+"""Tests for token- and character-budgeted output."""
+
+import pytest
+
+from minemizer import Encoder, minemize, presets
+
+ROWS = [{"id": i, "name": f"user{i}", "score": None if i % 2 else i * 0.5} for i in range(30)]
+
+
+def words(text: str) -> int:
+    return len(text.split())
+
+
+@pytest.mark.parametrize("preset", [None, presets.markdown, presets.compact])
+@pytest.mark.parametrize("budget", [0, 20, 60, 150, 400, 10_000])
+def test_max_chars_keeps_leading_rows_that_fit(preset, budget):
+    """The result is the output of the longest row prefix within the budget."""
+    encoder = Encoder(ROWS, preset=preset, header_repeat_interval=7)
+    result = encoder.encode_budget(ROWS, max_chars=budget)
+    assert result.text == (encoder.encode(ROWS[: result.rows]) if result.rows else "")
+    assert len(result.text) <= budget
+    if result.truncated:
+        assert len(encoder.encode(ROWS[: result.rows + 1])) > budget
+    assert minemize(ROWS, preset=preset, header_repeat_interval=7, max_chars=budget) == result.text
+
+
+def test_max_tokens_reports_rows_and_tokens():
+    """Token budgets use the given counter and report the exact count."""
+    result = Encoder(ROWS).encode_budget(ROWS, max_tokens=40, token_counter=words)
+    assert result.rows == 14 and result.total_rows == 30 and result.truncated
+    assert result.tokens == words(result.text) <= 40
+    assert minemize(ROWS, max_tokens=10**6, token_counter=words) == minemize(ROWS)
+
+
+def test_exact_check_drops_underestimated_rows():
+    """When the whole text counts more than its lines did, rows are dropped until it fits."""
+
+    def counter(text: str) -> int:
+        return len(text) + text.count("\n") ** 2
+
+    result = Encoder(ROWS).encode_budget(ROWS, max_tokens=300, token_counter=counter)
+    assert counter(result.text) <= 300 < counter(Encoder(ROWS).encode(ROWS[: result.rows + 1]))
+
+
+def test_exact_check_adds_overestimated_rows():
+    """When the lines counted more than the whole text, rows are added while they still fit."""
+
+    def rounding(text: str) -> int:
+        return (len(text) + 3) // 4
+
+    rows = [{"id": i} for i in range(10)]
+    result = Encoder(rows).encode_budget(rows, max_tokens=5, token_counter=rounding)
+    assert (result.rows, result.tokens, result.text) == (9, 5, Encoder(rows).encode(rows[:9]))
+
+    encoder = Encoder(ROWS, header_repeat_interval=7)
+    for budget in (10, 45, 90):
+        result = encoder.encode_budget(ROWS, max_tokens=budget, token_counter=rounding)
+        assert rounding(result.text) <= budget < rounding(encoder.encode(ROWS[: result.rows + 1]))
+
+
+def test_budget_validation_and_both_limits():
+    """A token budget needs a counter; character and token budgets apply together."""
+    with pytest.raises(ValueError):
+        minemize(ROWS, max_tokens=10)
+    both = Encoder(ROWS).encode_budget(ROWS, max_tokens=1000, token_counter=words, max_chars=60)
+    assert both.rows == Encoder(ROWS).encode_budget(ROWS, max_chars=60).rows
+    assert Encoder(ROWS).encode_budget([], max_chars=100).text == ""
+
+
+@pytest.mark.parametrize("preset", [None, presets.markdown, presets.compact])
+def test_budget_of_exact_document_length(preset):
+    """A budget equal to the length of the whole document keeps every row, including the last."""
+    rows = [{"id": 1, "name": "Alice"}, {"id": 2, "name": "Bob"}]
+    text = minemize(rows, preset=preset)
+    assert minemize(rows, preset=preset, max_chars=len(text)) == text
+    assert minemize(rows, preset=preset, max_chars=len(text) - 1) == minemize(rows[:1], preset=preset)
+    encoder = Encoder(ROWS, preset=preset, header_repeat_interval=7)
+    for n in range(1, len(ROWS) + 1):
+        assert encoder.encode_budget(ROWS, max_chars=len(encoder.encode(ROWS[:n]))).rows == n
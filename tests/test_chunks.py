@@ -0,0 +1,102 @@
+"""Tests for minemize_chunks()."""
+
+import pytest
+
+from minemizer import Columns, Encoder, minemize_chunks, presets
+
+ROWS = [{"id": i, "name": f"user{i}", "tags": ["a"] * (i % 3)} for i in range(25)]
+
+
+def words(text: str) -> int:
+    return len(text.split())
+
+
+@pytest.mark.parametrize("preset", [None, presets.markdown, presets.compact])
+def test_rows_per_chunk(preset):
+    """Each chunk is the encoding of its rows against one shared header."""
+    encoder = Encoder(ROWS, preset=preset)
+    chunks = list(minemize_chunks(ROWS, rows_per_chunk=10, preset=preset))
+    assert chunks == [encoder.encode(ROWS[i : i + 10]) for i in (0, 10, 20)]
+
+
+def test_shared_header_differs_from_per_chunk_inference():
+    """Sparse keys stay sparse in every chunk, even where they are common locally."""
+    rows = [{"id": 1}, {"id": 2}, {"id": 3}, {"id": 4, "x": 1}]
+    assert list(minemize_chunks(rows, rows_per_chunk=2)) == ["id\n1\n2", "id\n3\n4; x: 1"]
+
+
+def test_tokens_per_chunk():
+    """Chunks are filled up to the token budget, and cover all rows in order."""
+    encoder = Encoder(ROWS)
+    chunks = list(minemize_chunks(ROWS, tokens_per_chunk=30, token_counter=words))
+    assert all(words(chunk) <= 30 for chunk in chunks)
+
+    start = 0
+    for chunk in chunks:
+        rows = len(chunk.splitlines()) - 1
+        assert chunk == encoder.encode(ROWS[start : start + rows])
+        if start + rows < len(ROWS):
+            assert words(encoder.encode(ROWS[start : start + rows + 1])) > 30
+        start += rows
+    assert start == len(ROWS)
+
+
+def test_tokens_per_chunk_of_exact_document_length():
+    """A budget equal to the length of the whole document gives a single chunk."""
+    text = Encoder(ROWS).encode(ROWS)
+    assert list(minemize_chunks(ROWS, tokens_per_chunk=len(text), token_counter=len)) == [text]
+    chunks = list(minemize_chunks(ROWS, tokens_per_chunk=len(text) - 1, token_counter=len))
+    assert len(chunks) == 2 and chunks[0] == Encoder(ROWS).encode(ROWS[:-1])
+
+
+def test_tokens_per_chunk_with_overestimating_counter():
+    """Chunks are filled from exact counts, even where per-line counts round up."""
+
+    def rounding(text: str) -> int:
+        return (len(text) + 3) // 4
+
+    rows = [{"id": i} for i in range(10)]
+    encoder = Encoder(rows)
+    chunks = list(minemize_chunks(rows, tokens_per_chunk=5, token_counter=rounding))
+    assert chunks == [encoder.encode(rows[:9]), encoder.encode(rows[9:])]
+
+
+def test_oversized_row_gets_its_own_chunk():
+    """A row larger than the budget is not dropped."""
+    rows = [{"a": "x"}, {"a": "y " * 50}, {"a": "z"}]
+    chunks = list(minemize_chunks(rows, tokens_per_chunk=10, token_counter=words))
+    assert [len(chunk.splitlines()) for chunk in chunks] == [2, 2, 2]
+
+
+def test_lazy_generator_and_columns():
+    """One-shot iterables are consumed lazily; columnar input is chunked too."""
+    consumed = []
+
+    def rows():
+        for i in range(5000):
+            consumed.append(i)
+            yield {"id": i}
+
+    chunks = minemize_chunks(rows(), rows_per_chunk=5, schema_sample=5)
+    assert next(chunks) == "id\n0\n1\n2\n3\n4"
+    assert len(consumed) < 5000
+
+    columns = Columns({"id": list(range(7)), "name": list("abcdefg")})
+    assert len(list(minemize_chunks(columns, rows_per_chunk=3))) == 3
+
+
+def test_parallel_chunks():
+    """Worker processes format the rows, chunks are identical."""
+    expected = list(minemize_chunks(ROWS, rows_per_chunk=4))
+    assert list(minemize_chunks(ROWS, rows_per_chunk=4, workers=2)) == expected
+
+
+def test_chunk_arguments():
+    """Exactly one chunking mode is required."""
+    with pytest.raises(ValueError):
+        list(minemize_chunks(ROWS))
+    with pytest.raises(ValueError):
+        list(minemize_chunks(ROWS, rows_per_chunk=5, tokens_per_chunk=5, token_counter=words))
+    with pytest.raises(ValueError):
+        list(minemize_chunks(ROWS, tokens_per_chunk=5))
+    assert list(minemize_chunks([], rows_per_chunk=5)) == []
@@ -0,0 +1,82 @@
+"""Tests for column-oriented inputs."""
+
+from typing import Any
+
+import pytest
+
+from minemizer import Columns, Encoder, ParallelEncoder, iter_minemize, minemize, presets
+
+COLUMNS = {
+    "id": [1, 2, 3, 4],
+    "name": ["Alice", "Bob", None, "Dan"],
+    "contact": [{"email": "a@co.com"}, {"email": "b@co.com", "phone": "555"}, None, {"email": "d@co.com"}],
+    "tags": [["x"], [], ["y", "z"], None],
+}
+
+
+def as_rows(columns: dict) -> list[dict]:
+    return [dict(zip(columns, values, strict=True)) for values in zip(*columns.values(), strict=True)]
+
+
+@pytest.mark.parametrize("preset", [None, presets.markdown, presets.csv, presets.compact])
+def test_columns_match_rows(preset):
+    """Columns minemize exactly like the equivalent list of row dicts."""
+    expected = minemize(as_rows(COLUMNS), preset=preset)
+    assert minemize(Columns(COLUMNS), preset=preset) == expected
+    assert "\n".join(iter_minemize(Columns(COLUMNS), preset=preset)) == expected
+
+
+def test_columns_sparse_and_sampling():
+    """Sparsity threshold and schema sampling behave as for rows."""
+    rows = as_rows(COLUMNS)
+    cases: list[dict[str, Any]] = [{"sparsity_threshold": 0.9}, {"schema_sample": 2}, {"header_repeat_interval": 1}]
+    for overrides in cases:
+        assert minemize(Columns(COLUMNS), **overrides) == minemize(rows, **overrides)
+
+
+def test_columns_encoder_schema():
+    """An encoder with a wider schema fills missing columns, extra columns become sparse."""
+    encoder = Encoder([{"id": 1, "name": "x", "age": 3}])
+    result = encoder.encode(Columns({"name": ["Alice"], "id": [1], "city": ["Vilnius"]}))
+    assert result == "id; name; age\n1; Alice;; city: Vilnius"
+    assert result == encoder.encode([{"name": "Alice", "id": 1, "city": "Vilnius"}])
+
+
+def test_columns_validation():
+    """Columns must have equal lengths and a supported type."""
+    with pytest.raises(ValueError):
+        Columns({"a": [1, 2], "b": [1]})
+    with pytest.raises(TypeError):
+        Columns([1, 2])
+    assert minemize(Columns({"a": []})) == ""
+    assert len(Columns(COLUMNS).slice(1, 10)) == 3
+
+
+def test_plain_dict_is_still_a_row():
+    """A dict of lists without Columns keeps meaning a single row."""
+    assert minemize({"a": [1, 2], "b": [3, 4]}) == "a[]; b[]\n[ 1; 2];[ 3; 4]"
+
+
+def test_columns_parallel():
+    """Columnar chunks are sliced and formatted by the pool."""
+    columns = Columns({"id": list(range(25)), "name": [f"n{i}" for i in range(25)]})
+    with ParallelEncoder(columns, workers=2, chunk_size=4, header_repeat_interval=6) as encoder:
+        assert encoder.encode(columns) == minemize(columns, header_repeat_interval=6)
+
+
+def test_numpy_structured_array():
+    """NumPy structured arrays are read column by column."""
+    np = pytest.importorskip("numpy")
+    array = np.array([(1, 0.5, True), (2, 1.5, False)], dtype=[("id", "i8"), ("score", "f8"), ("ok", "?")])
+    rows = [{"id": 1, "score": 0.5, "ok": True}, {"id": 2, "score": 1.5, "ok": False}]
+    assert minemize(array) == minemize(rows)
+    assert minemize(array[::-1]) == minemize(rows[::-1])
+
+
+def test_pyarrow_table():
+    """pyarrow Tables and RecordBatches are read column by column, nulls become None."""
+    pa = pytest.importorskip("pyarrow")
+    table = pa.table({"id": [1, 2, 3], "name": ["Alice", None, "Carol"]})
+    rows = [{"id": 1, "name": "Alice"}, {"id": 2, "name": None}, {"id": 3, "name": "Carol"}]
+    assert minemize(table) == minemize(rows)
+    assert minemize(table.to_batches()[0]) == minemize(rows)
@@ -0,0 +1,62 @@
+"""Tests for using(): contextvar-scoped configuration."""
+
+import asyncio
+import threading
+
+from minemizer import minemize, presets, unminemize, using
+from minemizer.config import _NOT_PROVIDED
+from minemizer.core import _resolve_config
+
+ROWS = [{"a": 1, "b": "x"}, {"a": 2, "b": "y"}]
+
+
+def test_using_sets_default_config():
+    """Inside the block calls use the scoped config; overrides and presets still win."""
+    default = minemize(ROWS)
+    with using(presets.compact, delimiter="|") as cfg:
+        assert minemize(ROWS) == "a|b\n1|x\n2|y"
+        assert minemize(ROWS, delimiter=",") == "a,b\n1,x\n2,y"
+        assert minemize(ROWS, preset=presets.default) == default
+        assert unminemize(minemize(ROWS)) == ROWS
+        # No per-call derivation: the frozen config is used as is
+        assert _resolve_config(None, {"delimiter": _NOT_PROVIDED, "use_spaces": _NOT_PROVIDED}) is cfg
+        with using(use_spaces=True):
+            assert minemize(ROWS) == "a| b\n1| x\n2| y"
+        assert minemize(ROWS) == "a|b\n1|x\n2|y"
+    assert minemize(ROWS) == default
+
+
+def test_using_is_per_thread():
+    """A using() block in one thread does not affect another."""
+    results: dict[str, str] = {}
+    entered = threading.Event()
+    done = threading.Event()
+
+    def scoped() -> None:
+        with using(presets.csv):
+            entered.set()
+            done.wait(5)
+            results["scoped"] = minemize(ROWS)
+
+    thread = threading.Thread(target=scoped)
+    thread.start()
+    entered.wait(5)
+    results["other"] = minemize(ROWS)
+    done.set()
+    thread.join()
+    assert results == {"scoped": "a,b\n1,x\n2,y", "other": "a; b\n1; x\n2; y"}
+
+
+def test_using_is_per_task():
+    """Concurrent asyncio tasks each keep their own config across awaits."""
+
+    async def encode(preset) -> str:
+        with using(preset):
+            await asyncio.sleep(0)
+            await asyncio.sleep(0)
+            return minemize(ROWS)
+
+    async def main() -> list[str]:
+        return list(await asyncio.gather(encode(presets.csv), encode(presets.tsv), encode(presets.compact)))
+
+    assert asyncio.run(main()) == ["a,b\n1,x\n2,y", "a\tb\n1\tx\n2\ty", "a;b\n1;x\n2;y"]
@@ -0,0 +1,115 @@
+"""Tests for unminemize() and iter_unminemize()."""
+
+import io
+
+import pytest
+
+from minemizer import IncrementalEncoder, iter_minemize, iter_unminemize, minemize, presets, unminemize
+
+ROWS = [
+    {
+        "id": 1,
+        "name": "Alice",
+        "score": 9.5,
+        "active": True,
+        "contact": {"email": "a@co.com", "phone": None},
+        "tags": ["admin", "dev"],
+        "orders": [{"sku": "A-1", "qty": 2}, {"sku": "B-2", "qty": 1}],
+    },
+    {
+        "id": 2,
+        "name": "Bob",
+        "score": -3.25,
+        "active": False,
+        "contact": {"email": "b@co.com", "phone": "555-0100", "fax": "555-0101"},
+        "tags": [],
+        "orders": [],
+        "nickname": "bobby",
+    },
+    {
+        "id": 3,
+        "name": "Carol Ann",
+        "score": None,
+        "active": True,
+        "contact": None,
+        "tags": ["dev"],
+        "orders": [{"sku": "C-3", "qty": 10, "gift": True}],
+        "meta": {"source": "import", "ids": [7, 8]},
+    },
+    {
+        "id": 4,
+        "name": "007",
+        "score": 1e-05,
+        "active": False,
+        "contact": {"email": "d@co.com", "phone": None},
+        "tags": ["1.50"],
+        "orders": [{"sku": "D-4", "qty": 0}],
+        "extra": None,
+    },
+]
+
+PRESETS = [None, presets.markdown, presets.csv, presets.tsv, presets.compact]
+
+
+@pytest.mark.parametrize("preset", PRESETS)
+@pytest.mark.parametrize(
+    "overrides",
+    [{}, {"header_repeat_interval": 1}, {"row_prefix": "> ", "schema_prefix": "# "}, {"sparsity_threshold": 1.0}],
+)
+def test_round_trip(preset, overrides):
+    """Decoding minemize() output gives back its input, for every preset."""
+    text = minemize(ROWS, preset=preset, **overrides)
+    assert unminemize(text, preset=preset, **overrides) == ROWS
+
+
+@pytest.mark.parametrize("preset", [None, presets.markdown])
+def test_streaming_lines(preset):
+    """Line iterators (iter_minemize() output, files) decode like the whole text."""
+    rows = ROWS * 50
+    lines = iter_minemize(iter(rows), preset=preset, header_repeat_interval=7)
+    decoded = iter_unminemize(lines, preset=preset, header_repeat_interval=7)
+    assert next(decoded) == ROWS[0]
+    assert [ROWS[0], *decoded] == rows
+    text = minemize(rows, preset=preset)
+    assert list(iter_unminemize(io.StringIO(text + "\n"), preset=preset)) == rows
+
+
+def test_values():
+    """Only str() spellings become numbers; missing common keys come back as None."""
+    text = "a; b; c; d\n007; 1.50; -0; 12\n1e-05; true; x: y\n; ; ;"
+    assert unminemize(text) == [
+        {"a": "007", "b": "1.50", "c": "-0", "d": 12},
+        {"a": 1e-05, "b": True, "c": "x: y", "d": None},
+        {"a": None, "b": None, "c": None, "d": None},
+    ]
+    assert unminemize(minemize([{"a": None}, {"a": 1, "b": 2}])) == [{"a": None, "b": None}, {"a": 1, "b": 2}]
+    assert unminemize("") == []
+    assert unminemize(minemize([{}, {}])) == [{}, {}]
+
+
+@pytest.mark.parametrize("interval", [None, 1, 2, 100])
+def test_rows_equal_to_the_header(interval):
+    """Only lines at header_repeat_interval positions are headers, whatever the rows hold."""
+    rows = [{"k": "k", "v": "v"}, {"k": "a", "v": 1}, {"k": "k", "v": "v"}, {"k": "k", "v": "v"}]
+    assert unminemize(minemize(rows, header_repeat_interval=interval), header_repeat_interval=interval) == rows
+    empty = [{}, {}, {}]
+    assert unminemize(minemize(empty, header_repeat_interval=interval), header_repeat_interval=interval) == empty
+
+
+def test_schema_prefix_drift_header():
+    """With a schema_prefix, a new header applies to the rows below it."""
+    encoder = IncrementalEncoder(schema_prefix="# ")
+    rows = [{"a": 1}, {"a": 2}, {"a": 3, "b": 1}, {"a": 4, "b": 2}, {"a": 5, "b": 3}]
+    text = encoder.append(rows[:2]) + encoder.append(rows[2:3]) + encoder.append(rows[3:])
+    assert text.count("# ") == 2
+    assert unminemize(text, schema_prefix="# ") == rows
+
+
+def test_malformed_rows():
+    """Rows that do not fit the header raise ValueError with the line number."""
+    with pytest.raises(ValueError, match="Line 3"):
+        unminemize("id; meta{ a; b}\n1;{ 1; 2}\n2;{ 1; 2")
+    with pytest.raises(ValueError, match="Line 2"):
+        unminemize("id\n1; oops")
+    with pytest.raises(ValueError, match="Line 1"):
+        unminemize("id; tags[ x\n1")
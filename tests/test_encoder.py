@@ -0,0 +1,200 @@
+"""Tests for the reusable Encoder."""
+
+import pickle
+
+import pytest
+
+from minemizer import Encoder, ParallelEncoder, config, iter_minemize, minemize, presets
+
+
+def test_encoder_matches_minemize():
+    """Encoding the sample itself gives the same output as minemize()."""
+    data = [
+        {"id": 1, "name": "Alice", "contact": {"email": "a@co.com"}},
+        {"id": 2, "name": "Bob", "contact": {"email": "b@co.com", "phone": "555"}},
+    ]
+    assert Encoder(data).encode(data) == minemize(data)
+    assert Encoder(data, preset=presets.markdown).encode(data) == minemize(data, preset=presets.markdown)
+
+
+def test_encoder_reuses_schema():
+    """Later payloads are formatted against the sample's header, extra keys become sparse."""
+    encoder = Encoder([{"id": 1, "name": "Alice"}])
+    result = encoder.encode([{"id": 3}, {"id": 2, "name": "Bob", "age": 30}])
+    assert result == "id; name\n3\n2; Bob; age: 30"
+
+
+def test_encoder_explicit_schema():
+    """An encoder can be built from another encoder's header."""
+    first = Encoder([{"a": 1, "b": {"c": 2}}], delimiter="|")
+    second = Encoder(schema=first.header, delimiter="|")
+    assert second.encode({"a": 5, "b": {"c": 6}}) == "a| b{ c}\n5|{ 6}"
+
+
+def test_encoder_captures_config():
+    """Changing the global config after construction does not affect the encoder."""
+    encoder = Encoder([{"a": 1, "b": 2}])
+    original = config.delimiter
+    config.delimiter = "|"
+    try:
+        assert encoder.encode([{"a": 1, "b": 2}]) == "a; b\n1; 2"
+    finally:
+        config.delimiter = original
+
+
+def test_encoder_requires_sample_or_schema():
+    """Exactly one of sample data or schema must be given."""
+    with pytest.raises(ValueError):
+        Encoder()
+    with pytest.raises(ValueError):
+        Encoder([{"a": 1}], schema=[])
+
+
+def test_encoder_empty_input():
+    """Empty payloads produce an empty string."""
+    assert Encoder([{"a": 1}]).encode([]) == ""
+
+
+def test_encoder_pickles():
+    """An encoder survives pickling with its header and config."""
+    encoder = Encoder([{"a": 1, "b": {"c": 2}}], preset=presets.markdown)
+    restored = pickle.loads(pickle.dumps(encoder))
+    rows = [{"a": 3, "b": {"c": 4}}, {"a": 5, "x": 6}]
+    assert restored.encode(rows) == encoder.encode(rows)
+
+
+def test_header_element_tree():
+    """Header nodes carry integer kinds and child lookups, and are independent of the config."""
+    from minemizer.core import HeaderElement
+
+    header = Encoder([{"id": 1, "tags": ["x"], "meta": {"a": 1, "b": 2}, "items": [{"q": 1}]}]).header
+    assert [el.kind for el in header] == [
+        HeaderElement.VALUE,
+        HeaderElement.LIST,
+        HeaderElement.DICT,
+        HeaderElement.DICT_LIST,
+    ]
+    meta = header[2]
+    assert meta.schema_keys == frozenset({"a", "b"})
+    assert meta.index == {"a": 0, "b": 1}
+    assert not hasattr(meta, "__dict__")
+    assert meta.to_string(presets.default) == "meta{ a; b}"
+    assert meta.to_string(presets.compact) == "meta{a;b}"
+
+    restored = pickle.loads(pickle.dumps(header))
+    assert restored == header and restored[2].index == meta.index
+    assert hash(restored[3]) == hash(header[3])
+
+
+def test_encoder_row_shapes():
+    """Rows of the same key shape share a plan; equal-but-distinct keys keep their own names."""
+    encoder = Encoder([{"id": 1}])
+    rows = [{"id": 1, "x": 2}, {"x": 3, "id": 2}, {"id": 3, "x": 4}, {"id": 4, 1: "a"}, {"id": 5, True: "b"}]
+    assert encoder.encode(rows) == "id\n1; x: 2\n2; x: 3\n3; x: 4\n4; 1: a\n5; True: b"
+    assert len(encoder._shapes.shapes) == 3
+
+    nested = [{"m": {"a": 1, "z": 2}}, {"m": {"a": 2}}, {"m": {"a": 3, "z": 4}}]
+    assert Encoder(nested, sparsity_threshold=0.8).encode(nested) == minemize(nested, sparsity_threshold=0.8)
+
+
+# =============================================================================
+# Parallel Encoding Tests
+# =============================================================================
+
+
+PARALLEL_ROWS = [
+    {"id": i, "name": f"user{i}", "tags": ["a", "b"][: i % 3], "meta": {"ok": i % 2 == 0}} for i in range(53)
+]
+
+
+@pytest.mark.parametrize("interval", [None, 1, 4, 5, 10])
+def test_parallel_encoder_matches_encoder(interval):
+    """Chunks are reassembled in order, with header repeats across chunk boundaries."""
+    expected = minemize(PARALLEL_ROWS, header_repeat_interval=interval)
+    with ParallelEncoder(PARALLEL_ROWS, workers=2, chunk_size=5, header_repeat_interval=interval) as encoder:
+        assert encoder.encode(PARALLEL_ROWS) == expected
+        # The pool is reused for later payloads
+        assert encoder.encode(PARALLEL_ROWS[:7]) == Encoder(PARALLEL_ROWS, header_repeat_interval=interval).encode(
+            PARALLEL_ROWS[:7]
+        )
+
+
+def test_minemize_workers():
+    """workers= gives the same output as in-process formatting."""
+    assert minemize(PARALLEL_ROWS, workers=2, preset=presets.csv) == minemize(PARALLEL_ROWS, preset=presets.csv)
+    streamed = "\n".join(iter_minemize((row for row in PARALLEL_ROWS), workers=2))
+    assert streamed == minemize(PARALLEL_ROWS)
+
+
+# =============================================================================
+# Schema Cache Tests
+# =============================================================================
+
+
+@pytest.fixture
+def schema_cache():
+    from minemizer.core import schema_cache
+
+    maxsize = schema_cache.maxsize
+    schema_cache.clear()
+    yield schema_cache
+    schema_cache.maxsize = maxsize
+    schema_cache.clear()
+
+
+def test_schema_cache_hits_same_structure(schema_cache):
+    """Payloads with the same header but different values or counts reuse the cached encoder."""
+    page1 = [{"id": 1, "user": {"name": "Alice"}, "tags": ["a"]}, {"id": 2, "user": {"name": "Bob"}, "tags": []}]
+    page2 = [{"id": 3, "user": {"name": "Carol"}, "tags": ["b"]}, {"id": 4, "user": {"name": "Dan"}, "tags": []}]
+    assert minemize(page1, schema_cache=True) == minemize(page1)
+    assert minemize(page2, schema_cache=True) == minemize(page2)
+    assert (schema_cache.hits, schema_cache.misses) == (1, 1)
+
+    # Other counts with the same header hit; a key turning sparse, other nesting or config miss
+    assert minemize(page1 + [{"id": 5}], schema_cache=True) == minemize(page1 + [{"id": 5}])
+    assert minemize(page1 + [{"id": 5}] * 3, schema_cache=True) == minemize(page1 + [{"id": 5}] * 3)
+    minemize([{**page1[0], "user": [{"name": "Alice"}]}], schema_cache=True)
+    minemize(page1, schema_cache=True, preset=presets.markdown)
+    assert (schema_cache.hits, schema_cache.misses) == (2, 4)
+
+
+def test_schema_cache_hit_skips_inference(schema_cache, monkeypatch):
+    """A hit is found from the rows' structure alone: no statistics pass, no header building."""
+    import minemizer.core
+    from minemizer import Columns
+
+    page = [{"id": 1, "user": {"name": "A"}}, {"id": 2, "user": {"name": "B", "age": 3}, "note": "x"}]
+    page.append({"id": 3, "user": {"name": "C"}})
+    minemize(page, schema_cache=True)
+    minemize(Columns({"id": [1], "name": ["Alice"]}), schema_cache=True)
+
+    def fail(*args):
+        raise AssertionError("header inference ran on a cache hit")
+
+    for name in ("_collect_stats", "_collect_column_stats", "_build_header"):
+        monkeypatch.setattr(minemizer.core, name, fail)
+    # Other row counts, same sparsity outcomes: age and note stay sparse
+    bigger = [*page, {"id": 4, "user": None}]
+    assert minemize(bigger, schema_cache=True) == "id; user{ name; ...}\n1;{ A}\n2;{ B; age: 3}; note: x\n3;{ C}\n4;"
+    assert minemize(Columns({"id": [2, 3], "name": ["Bob", None]}), schema_cache=True) == "id; name\n2; Bob\n3;"
+    assert (schema_cache.hits, schema_cache.misses) == (2, 2)
+
+
+def test_schema_cache_eviction_and_clear(schema_cache):
+    """The cache keeps at most maxsize entries, least recently used evicted first."""
+    schema_cache.maxsize = 2
+    for key in ("a", "b", "a", "c", "a", "b"):
+        minemize([{key: 1}], schema_cache=True)
+    assert len(schema_cache) == 2
+    assert (schema_cache.hits, schema_cache.misses) == (2, 4)
+
+    schema_cache.clear()
+    assert (len(schema_cache), schema_cache.hits, schema_cache.misses) == (0, 0, 0)
+
+
+def test_schema_cache_non_string_keys(schema_cache):
+    """Sparse keys that compare equal but print differently (1 and True) print as themselves."""
+    for key in (1, True):
+        rows = [{"id": 1}, {"id": 2}, {"id": 3, key: "x"}]
+        assert minemize(rows, schema_cache=True) == f"id\n1\n2\n3; {key}: x"
+    assert (schema_cache.hits, schema_cache.misses) == (1, 1)
@@ -0,0 +1,55 @@
+"""Tests for IncrementalEncoder."""
+
+import pytest
+
+from minemizer import IncrementalEncoder, minemize, presets
+
+ROWS = [{"id": i, "name": f"user{i}", "meta": {"level": i % 3}} for i in range(10)]
+
+
+@pytest.mark.parametrize("preset", [None, presets.markdown, presets.compact])
+def test_appends_match_minemize(preset):
+    """Without schema drift, appending in batches gives the minemize() output of all rows."""
+    encoder = IncrementalEncoder(preset=preset, header_repeat_interval=4)
+    output = ""
+    for start in range(0, len(ROWS), 3):
+        output += encoder.append(ROWS[start : start + 3])
+    assert output == minemize(ROWS, preset=preset, header_repeat_interval=4)
+    assert encoder.rows == len(ROWS)
+
+
+def test_schema_drift_emits_new_header():
+    """A key becoming common re-emits the header once, earlier output is kept."""
+    encoder = IncrementalEncoder()
+    assert encoder.append([{"a": 1}, {"a": 2}]) == "a\n1\n2"
+    # b is in 1 of 3 rows: below the threshold, stays sparse
+    assert encoder.append({"a": 3, "b": 1}) == "\n3; b: 1"
+    # b is now in 3 of 5 rows
+    assert encoder.append([{"a": 4, "b": 2}, {"a": 5, "b": 3}]) == "\na; b\n4; 2\n5; 3"
+    assert encoder.append([{"a": 6, "b": 4}]) == "\n6; 4"
+    assert [el.name for el in encoder.header] == ["a", "b"]
+
+
+def test_header_repeat_interval_across_appends():
+    """Rows are counted across appends, and a drift header restarts the count."""
+    encoder = IncrementalEncoder(header_repeat_interval=2)
+    assert encoder.append([{"a": 1}]) == "a\n1"
+    assert encoder.append([{"a": 2}]) == "\n2"
+    assert encoder.append([{"a": 3}, {"a": 4}, {"a": 5}]) == "\na\n3\n4\na\n5"
+
+
+def test_schema_sample_freezes_header():
+    """With schema_sample only the first rows appended shape the header."""
+    encoder = IncrementalEncoder(schema_sample=2)
+    encoder.append([{"a": 1}, {"a": 2}])
+    assert encoder.append([{"a": 3, "b": 1}, {"a": 4, "b": 2}, {"a": 5, "b": 3}]) == "\n3; b: 1\n4; b: 2\n5; b: 3"
+
+
+def test_empty_append_and_sampling_mode():
+    """Empty appends add nothing; only head sampling is possible."""
+    encoder = IncrementalEncoder()
+    assert encoder.append([]) == ""
+    assert encoder.rows == 0 and encoder.header == []
+    assert encoder.append({"a": 1}) == "a\n1"
+    with pytest.raises(ValueError):
+        IncrementalEncoder(schema_sample=10, schema_sample_mode="stride")
@@ -1,5 +1,8 @@
 """Tests for the minemize function."""
 
+import json
+from pathlib import Path
+
 import pytest
 
 from minemizer import config, minemize
@@ -373,6 +376,19 @@ def test_regression_empty_structures():
     assert "[]" in result
 
 
+def test_regression_header_key_order_and_majority():
+    """Ensure schema keys keep first-appearance order and nested majority types."""
+    data = [
+        {"id": 1, "items": [{"sku": "a"}, None, {"sku": "b", "qty": 2}]},
+        {"items": [{"sku": "c", "qty": 1}], "id": 2, "note": "x"},
+        {"id": 3, "items": "n/a"},
+    ]
+    result = minemize(data)
+
+    assert result.split("\n")[0] == "id; items[{ sku; qty}]"
+    assert result.split("\n")[2] == "2;[{ c; 1}]; note: x"
+
+
 # =============================================================================
 # Cleanup Optimization Tests
 # =============================================================================
@@ -516,3 +532,161 @@ def test_config_derive_with_none():
 
     assert derived.header_repeat_interval is None
     assert cfg.header_repeat_interval == 100  # Original unchanged
+
+
+def test_config_freeze():
+    """Frozen configs are immutable, hashable snapshots with the same behavior."""
+    from dataclasses import FrozenInstanceError, fields
+
+    from minemizer.config import Config, FrozenConfig, presets
+
+    assert [(f.name, f.type) for f in fields(Config)] == [(f.name, f.type) for f in fields(FrozenConfig) if f.init]
+
+    cfg = Config(delimiter="|")
+    frozen = cfg.freeze()
+    assert frozen == Config(delimiter="|").freeze()
+    assert {frozen: 1}[Config(delimiter="|").freeze()] == 1
+    assert frozen.freeze() is frozen and frozen.thaw() == cfg
+    with pytest.raises(FrozenInstanceError):
+        frozen.delimiter = ";"  # type: ignore[misc]
+
+    cfg.delimiter = ","
+    assert frozen.delimiter == "|"
+    assert frozen.derive(delimiter=",") == cfg.freeze()
+
+    text = "a; ; b: true; { x; [ ; }] \n"
+    for preset in (Config(), presets.markdown, presets.csv, presets.compact, Config(common_optimizations=False)):
+        assert preset.freeze().cleanup(text) == preset.cleanup(text)
+        assert minemize([{"a": 1, "b": {"c": True}}], preset=preset.freeze()) == minemize(
+            [{"a": 1, "b": {"c": True}}], preset=preset
+        )
+
+
+# =============================================================================
+# Schema Sampling Tests
+# =============================================================================
+
+
+def test_schema_sample_head():
+    """Keys outside the sampled rows fall back to sparse fields."""
+    data = [{"id": 1}, {"id": 2}, {"id": 3, "city": "NYC"}, {"id": 4, "city": "LA"}]
+    assert minemize(data) == "id; city\n1\n2\n3; NYC\n4; LA"
+    assert minemize(data, schema_sample=2) == "id\n1\n2\n3; city: NYC\n4; city: LA"
+
+
+def test_schema_sample_stride():
+    """Stride sampling picks evenly spaced rows."""
+    data = [{"id": i, "even": True} if i % 2 == 0 else {"id": i} for i in range(10)]
+    result = minemize(data, schema_sample=5, schema_sample_mode="stride")
+    assert result.split("\n")[0] == "id; even"
+
+
+def test_schema_sample_reservoir_is_stable():
+    """Reservoir sampling is deterministic between calls."""
+    data = [{"id": i, f"k{i % 7}": i} for i in range(200)]
+    first = minemize(data, schema_sample=20, schema_sample_mode="reservoir", sparsity_threshold=0.1)
+    assert first == minemize(data, schema_sample=20, schema_sample_mode="reservoir", sparsity_threshold=0.1)
+
+
+def test_schema_sample_unknown_mode():
+    """Unknown sampling modes are rejected."""
+    with pytest.raises(ValueError):
+        minemize([{"a": 1}, {"a": 2}], schema_sample=1, schema_sample_mode="bogus")
+
+
+# =============================================================================
+# Emitter Tests: output must match the str.replace reference path
+# =============================================================================
+
+FIXTURES_DIR = Path(__file__).parent.parent / "benchmarks" / "fixtures" / "compression"
+
+TRICKY_ROWS = [
+    {"a": None, "b": "", "c": "true story", "d": "nullable", "e": [None, "", {"x": None}]},
+    {"a": "x; y", "b": "{ }", "c": " ", "d": "09:30:00", "e": {"k": "a: true"}},
+    {"a": {"b": {"c": {"d": 1}}}, "b": [[[1, 2]]], "c": "line\nbreak", "d": ":x", "e": {}},
+    {"a": 1, "b": 2, "extra": "", "deep": {"n": None}},
+]
+
+
+@pytest.mark.parametrize("fixture", sorted(FIXTURES_DIR.glob("*.json")), ids=lambda p: p.stem)
+@pytest.mark.parametrize("preset_name", ["default", "markdown", "csv", "compact"])
+def test_emitter_matches_reference_on_fixtures(fixture: Path, preset_name: str):
+    """The emitter reproduces the cleanup-based reference output byte for byte."""
+    from minemizer import presets
+    from minemizer.core import _serialize_reference
+
+    data = json.loads(fixture.read_text())
+    preset = getattr(presets, preset_name)
+    assert minemize(data, preset=preset) == _serialize_reference(data, preset)
+
+
+@pytest.mark.parametrize(
+    "overrides",
+    [{}, {"common_optimizations": False}, {"delimiter": "|", "wrap_lines": "|"}, {"row_prefix": "- "}],
+)
+def test_emitter_matches_reference_on_tricky_values(overrides: dict):
+    """Values that cleanup() itself rewrites still produce identical output."""
+    from minemizer.core import _serialize_reference
+
+    cfg = config.derive(**overrides)
+    for rows in (TRICKY_ROWS, TRICKY_ROWS[:1], TRICKY_ROWS[1:3]):
+        assert minemize(rows, **overrides) == _serialize_reference(rows, cfg)
+
+
+@pytest.mark.parametrize("preset_name", ["default", "csv", "compact"])
+def test_scalar_column_batches_match_reference(preset_name: str):
+    """Columns formatted as int/float/bool batches match value-by-value formatting."""
+    import enum
+
+    from minemizer import presets
+    from minemizer.core import _BLOCK_ROWS, _serialize_reference
+
+    class Level(enum.IntEnum):
+        LOW = 1
+
+    rows = [
+        {"i": n, "f": n / 7, "b": n % 3 == 0, "mixed": [n, 0.5, True, None][n % 4], "odd": [n, Level.LOW][n % 2]}
+        for n in range(_BLOCK_ROWS + 10)
+    ]
+    rows[3]["f"] = float("inf")
+    rows[_BLOCK_ROWS + 1]["i"] = "x; y"
+    preset = getattr(presets, preset_name)
+    assert minemize(rows, preset=preset) == _serialize_reference(rows, preset)
+
+
+@pytest.mark.parametrize("overrides", [{}, {"common_optimizations": False}, {"row_prefix": "- ", "wrap_lines": "|"}])
+def test_flat_rows_match_reference(overrides: dict):
+    """Flat rows joined column-wise keep every cleanup() rule, including in the last column."""
+    from minemizer.core import _serialize_reference
+
+    texts = ["plain", "", None, "true", "nullable", "09:30:00", ":x", "a: b", "x;y", " ", "{", "falsey"]
+    rows = [{"id": i, "a": texts[i % len(texts)], "b": texts[(i * 5) % len(texts)]} for i in range(40)]
+    cfg = config.derive(**overrides)
+    assert minemize(rows, **overrides) == _serialize_reference(rows, cfg)
+    uniform = [{"id": i, "name": f"user{i}", "ok": i % 2 == 0} for i in range(40)]
+    assert minemize(uniform, **overrides) == _serialize_reference(uniform, cfg)
+
+
+@pytest.mark.parametrize("preset_name", ["default", "markdown", "compact"])
+def test_codegen_matches_reference(preset_name: str):
+    """Generated column formatters produce the same text as the interpreted ones."""
+    from minemizer import presets
+    from minemizer.core import _serialize_reference
+
+    preset = getattr(presets, preset_name)
+    for fixture in sorted(FIXTURES_DIR.glob("*.json")):
+        data = json.loads(fixture.read_text())
+        assert minemize(data, preset=preset, codegen=True) == _serialize_reference(data, preset)
+    for rows in (TRICKY_ROWS, TRICKY_ROWS[1:3]):
+        assert minemize(rows, preset=preset, codegen=True) == _serialize_reference(rows, preset)
+
+
+def test_codegen_keeps_names_out_of_source():
+    """Schema keys are bound as constants, never spliced into the generated source."""
+    from minemizer import Encoder
+
+    rows = [{"m": {'x"); import os; ("': 1, "{": {"true": True}, "n": [{"a": 1}]}}] * 2
+    encoder = Encoder(rows, codegen=True)
+    column = encoder._emit_plan[0][1]
+    assert "import os" not in column.__source__  # type: ignore[attr-defined]
+    assert encoder.encode(rows) == minemize(rows)
@@ -0,0 +1,47 @@
+"""Tests for record-level output."""
+
+import pytest
+
+from minemizer import Columns, Encoder, minemize_records, presets
+
+ROWS = [
+    {"id": 1, "text": "first line\nsecond line", "meta": {"lang": "en"}},
+    {"id": 2, "text": "short", "meta": {"lang": "lt", "draft": True}},
+    {"id": 3, "text": None, "meta": None},
+]
+
+
+@pytest.mark.parametrize("preset", [None, presets.markdown, presets.csv])
+def test_records_match_single_record_documents(preset):
+    """Every record's document is what the encoder writes for that record alone."""
+    records = minemize_records(ROWS, preset=preset)
+    encoder = Encoder(ROWS, preset=preset)
+    assert len(records) == len(ROWS)
+    for i, row in enumerate(ROWS):
+        assert records.document(i) == encoder.encode([row])
+
+
+def test_records_keep_embedded_newlines():
+    """A value with a newline stays inside its record's row."""
+    records = minemize_records(ROWS)
+    assert records.header == "id; text; meta{ lang; draft}"
+    assert records[0] == "1; first line\nsecond line;{ en;}"
+    assert records[1] == "2; short;{ lt;true}"
+    assert records[2] == "3;;"
+    assert list(records) == records.rows and records[1:] == records.rows[1:]
+
+
+def test_records_ignore_header_repeats():
+    """Rows are never interleaved with repeated headers."""
+    rows = [{"id": i} for i in range(5)]
+    records = minemize_records(rows, header_repeat_interval=2)
+    assert records.rows == ["0", "1", "2", "3", "4"]
+
+
+def test_records_from_generator_and_columns():
+    """One-shot iterables and columnar data map source index to row the same way."""
+    expected = minemize_records(ROWS)
+    assert minemize_records(iter(ROWS)) == expected
+    columns = Columns({"id": [1, 2], "name": ["a", "b"]})
+    assert minemize_records(columns).rows == ["1; a", "2; b"]
+    assert minemize_records({"id": 7}).rows == ["7"]
@@ -0,0 +1,85 @@
+"""Tests for the byte-offset row index."""
+
+import io
+import mmap
+
+import pytest
+
+from minemizer import RowIndex, minemize, minemize_to, presets
+
+ROWS = [{"id": i, "name": f"naïve {i}" if i % 4 == 0 else f"user{i}", "x": None} for i in range(23)]
+
+
+def write_indexed(rows, **kwargs) -> tuple[bytes, RowIndex]:
+    buffer = io.BytesIO()
+    index = minemize_to(rows, buffer, index=True, **kwargs)
+    assert index is not None
+    return buffer.getvalue(), index
+
+
+def expected_slice(text: str, header_lines: int, start: int, stop: int) -> str:
+    """The header block plus the file's lines from row start through row stop-1."""
+    lines = text.split("\n")
+    header = lines[:header_lines]
+    rows = [j for j, line in enumerate(lines) if line not in header]
+    return "\n".join(header + lines[rows[start] : rows[stop - 1] + 1])
+
+
+@pytest.mark.parametrize("preset", [None, presets.markdown])
+@pytest.mark.parametrize("interval", [None, 5])
+def test_index_slices_rows(preset, interval):
+    """Any row range reads back as the header plus exactly those rows of the file."""
+    data, index = write_indexed(ROWS, preset=preset, header_repeat_interval=interval)
+    text = minemize(ROWS, preset=preset, header_repeat_interval=interval)
+    assert data.decode() == text
+    assert len(index) == len(ROWS)
+
+    header_lines = 2 if preset is presets.markdown else 1
+    for start, stop in [(0, 1), (3, 4), (4, 11), (22, 23), (0, 23)]:
+        assert index.read(data, start, stop).decode() == expected_slice(text, header_lines, start, stop)
+    assert index.read(data, 0, len(ROWS)) == data
+
+
+def test_header_positions_are_marked():
+    """Rows directly after a header block carry the HEADER bit."""
+    _, index = write_indexed(ROWS, header_repeat_interval=10)
+    assert [i for i in range(len(index)) if index.after_header(i)] == [0, 10, 20]
+    assert index.start(0) == index.header_size == len(b"id; name; x\n")
+    assert not index.offsets[-1] & RowIndex.HEADER
+
+
+def test_index_mmap_and_dump(tmp_path):
+    """Indexes round-trip through dump()/load() and slice memory-mapped files."""
+    path = tmp_path / "rows.txt"
+    with open(path, "w", encoding="utf-8", newline="") as fp:
+        index = minemize_to(ROWS, fp, index=True, header_repeat_interval=7, flush_size=16)
+    assert index is not None
+    stored = io.BytesIO()
+    index.dump(stored)
+    stored.seek(0)
+    loaded = RowIndex.load(stored)
+    assert loaded.offsets == index.offsets and loaded.header_size == index.header_size
+
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+        text = minemize(ROWS, header_repeat_interval=7)
+        assert loaded.read(m, 6, 9).decode() == expected_slice(text, 1, 6, 9)
+
+
+def test_index_parallel_and_empty():
+    """Parallel formatting builds the same index; empty input has no rows."""
+    data, index = write_indexed(ROWS, header_repeat_interval=4)
+    parallel_data, parallel_index = write_indexed(ROWS, header_repeat_interval=4, workers=2)
+    assert parallel_data == data and parallel_index.offsets == index.offsets
+    data, index = write_indexed([])
+    assert data == b"" and len(index) == 0 and index.read(data, 0, 5) == b""
+    assert minemize_to(ROWS, io.StringIO()) is None
+
+
+def test_read_empty_row():
+    """A row with only empty values is an empty line, still read back under the header."""
+    rows = [{"a": None}, {"a": None}]
+    data, index = write_indexed(rows)
+    assert data == b"a\n\n" and len(index) == 2
+    assert index.read(data, 0, 1) == index.read(data, 1, 2) == b"a\n"
+    assert index.read(data, 0, 2) == data
+    assert index.read(data, 2, 3) == b"" and index.read(data, 1, 1) == b""
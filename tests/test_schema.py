@@ -0,0 +1,160 @@
+"""Tests for explicit Schemas."""
+
+import asyncio
+import io
+import json
+import pickle
+from dataclasses import dataclass, field
+from typing import NotRequired, Optional, TypedDict
+
+import pytest
+
+from minemizer import (
+    Encoder,
+    IncrementalEncoder,
+    Schema,
+    aminemize,
+    iter_minemize,
+    minemize,
+    minemize_chunks,
+    minemize_records,
+    presets,
+)
+
+SPEC = {
+    "id": int,
+    "contact": {"email": str, ...: ...},
+    "tags": list,
+    "orders": [{"sku": str, "qty": int}],
+    "meta": dict,
+}
+HEADER = "id; contact{ email; ...}; tags[]; orders[{ sku; qty}]; meta{ ...}"
+
+ROWS = [
+    {"id": 1, "contact": {"email": "a@co.com", "phone": "555"}, "tags": ["x"], "orders": [], "meta": {"k": 1}},
+    {"id": 2, "contact": None, "tags": [], "orders": [{"sku": "A", "qty": 2}], "meta": {}, "extra": True},
+]
+
+
+@dataclass
+class Item:
+    sku: str
+    qty: int
+
+
+@dataclass
+class Node:
+    name: str
+    children: list["Node"] = field(default_factory=list)
+
+
+@dataclass
+class Order:
+    id: int
+    items: list[Item]
+    tags: tuple[str, ...]
+    meta: dict[str, int]
+    note: Optional[str] = None  # noqa: UP045 - Optional is part of what is tested
+    tree: Node | None = None
+
+
+class OrderDict(TypedDict):
+    id: int
+    items: NotRequired[list[Item]]
+
+
+def test_spec_and_parse():
+    """A nested spec gives the header it describes; parse() reads it back."""
+    schema = Schema(SPEC)
+    assert schema.to_string() == HEADER
+    assert Schema.parse(HEADER) == schema
+    assert Schema.parse("id;contact{email;...}", preset=presets.compact) == Schema(["id", *schema[1:2]])
+    assert [el.name for el in schema] == list(SPEC) and len(schema) == 5
+    assert pickle.loads(pickle.dumps(schema)) == schema
+    assert Schema(Encoder(ROWS).header) == Schema.infer(ROWS)
+    with pytest.raises(ValueError):
+        Schema({"orders": [int]})
+
+
+def test_from_type():
+    """Dataclasses and TypedDicts map nested records, lists and optionals; recursion stops."""
+    schema = Schema.from_type(Order)
+    assert schema.to_string() == "id; items[{ sku; qty}]; tags[]; meta{ ...}; note; tree{ name; children[{ ...}]}"
+    assert Schema.from_type(OrderDict).to_string() == "id; items[{ sku; qty}]"
+    with pytest.raises(TypeError):
+        Schema.from_type(dict)
+
+
+def test_from_json_schema():
+    """JSON Schema objects, arrays, local $refs and nullable anyOf are followed."""
+    description = {
+        "type": "object",
+        "properties": {
+            "id": {"type": "integer"},
+            "contact": {"anyOf": [{"$ref": "#/$defs/Contact"}, {"type": "null"}]},
+            "tags": {"type": "array", "items": {"type": "string"}},
+            "orders": {"type": "array", "items": {"$ref": "#/$defs/Order"}},
+            "meta": {"type": "object"},
+        },
+        "$defs": {
+            "Contact": {"type": "object", "properties": {"email": {"type": "string"}}, "additionalProperties": True},
+            "Order": {"type": "object", "properties": {"sku": {"type": "string"}, "qty": {"type": "integer"}}},
+        },
+    }
+    assert Schema.from_json_schema(description) == Schema(SPEC)
+    assert Schema.from_json_schema(json.dumps(description)) == Schema(SPEC)
+    with pytest.raises(ValueError):
+        Schema.from_json_schema({"type": "string"})
+
+
+@pytest.mark.parametrize("preset", [None, presets.markdown, presets.compact])
+def test_apis_use_schema_without_inference(preset):
+    """Every API formats with the schema's header, whatever the rows look like."""
+    schema = Schema(SPEC)
+    expected = Encoder(schema=schema, preset=preset).encode(ROWS)
+    assert schema.to_string(preset or presets.default) in expected.splitlines()[0]
+    assert minemize(ROWS, schema=schema, preset=preset) == expected
+    assert minemize(ROWS[1:], schema=schema, preset=preset).splitlines()[0] == expected.splitlines()[0]
+    assert "\n".join(iter_minemize(iter(ROWS), schema=schema, preset=preset)) == expected
+    assert list(minemize_chunks(ROWS, rows_per_chunk=5, schema=schema, preset=preset)) == [expected]
+    assert minemize_records(ROWS, schema=schema, preset=preset).document(0) == Encoder(
+        schema=schema, preset=preset
+    ).encode(ROWS[:1])
+    assert asyncio.run(aminemize(ROWS, schema=schema, preset=preset)) == expected
+
+
+def test_schema_keeps_header_stable():
+    """Keys outside the schema stay sparse, and an incremental encoder never drifts."""
+    schema = Schema(["a"])
+    rows = [{"a": 1, "b": 1}, {"a": 2, "b": 2}]
+    assert minemize(rows) == "a; b\n1; 1\n2; 2"
+    assert minemize(rows, schema=schema) == "a\n1; b: 1\n2; b: 2"
+    encoder = IncrementalEncoder(schema=schema)
+    assert encoder.append(rows) + encoder.append(rows) == "a\n1; b: 1\n2; b: 2\n1; b: 1\n2; b: 2"
+
+
+def test_dumps_and_loads():
+    """A saved schema loads back with its config and formats exactly like the original."""
+    schema = Schema.infer(ROWS, preset=presets.markdown, sparsity_threshold=0.2)
+    text = schema.dumps()
+    loaded = Schema.loads(text)
+    assert loaded == schema and loaded.config is schema.config
+    assert json.loads(text)["version"] == 1
+    assert minemize(ROWS, schema=loaded, preset=loaded.config) == minemize(
+        ROWS, preset=presets.markdown, sparsity_threshold=0.2
+    )
+    buffer = io.StringIO()
+    Schema(SPEC).dump(buffer)
+    buffer.seek(0)
+    restored = Schema.load(buffer)
+    assert restored == Schema(SPEC) and restored.config is None
+    assert pickle.loads(pickle.dumps(schema)).config == schema.config
+
+
+def test_loads_rejects_other_versions():
+    """Documents of another format version or with unknown Config fields are refused."""
+    document = json.loads(Schema.infer(ROWS).dumps())
+    with pytest.raises(ValueError, match="version"):
+        Schema.loads(json.dumps({**document, "version": 2}))
+    with pytest.raises(ValueError, match="Config"):
+        Schema.loads(json.dumps({**document, "config": {"colour": "blue"}}))
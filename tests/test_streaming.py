@@ -0,0 +1,92 @@
+"""Tests for streaming output."""
+
+import io
+import itertools
+from typing import Any
+
+import pytest
+
+from minemizer import iter_minemize, minemize, minemize_to, presets
+
+
+def test_iter_minemize_matches_minemize():
+    """Joined lines equal minemize() output, including repeated headers."""
+    data = [{"id": i, "name": f"person_{i}", "extra": None if i % 2 else ""} for i in range(25)]
+    cases: list[dict[str, Any]] = [
+        {},
+        {"header_repeat_interval": 10},
+        {"preset": presets.markdown, "header_repeat_interval": 7},
+    ]
+    for kwargs in cases:
+        assert "\n".join(iter_minemize(data, **kwargs)) == minemize(data, **kwargs)
+
+
+def test_iter_minemize_generator_input():
+    """Generators are accepted and produce the same lines as the equivalent list."""
+    data = [{"a": i, "b": {"c": i * 2}} for i in range(30)]
+    lines = list(iter_minemize((row for row in data), header_repeat_interval=10))
+    assert lines == minemize(data, header_repeat_interval=10).split("\n")
+
+
+def test_iter_minemize_is_lazy():
+    """Rows are pulled from the source only as output lines are consumed."""
+    consumed = 0
+
+    def rows():
+        nonlocal consumed
+        for i in itertools.count():
+            consumed += 1
+            yield {"id": i}
+
+    lines = iter_minemize(rows())
+    assert consumed == 0
+    assert list(itertools.islice(lines, 3)) == ["id", "0", "1"]
+    assert consumed < 2000
+
+
+def test_iter_minemize_empty():
+    """Empty input yields no lines."""
+    assert list(iter_minemize([])) == []
+    assert list(iter_minemize(iter([]))) == []
+
+
+def test_iter_minemize_schema_sample():
+    """Streaming infers the header from the first schema_sample rows."""
+    rows = ({"id": i, "late": i} if i >= 2 else {"id": i} for i in range(4))
+    assert list(iter_minemize(rows, schema_sample=2)) == ["id", "0", "1", "2; late: 2", "3; late: 3"]
+
+
+def test_iter_minemize_rejects_non_head_sampling_for_iterators():
+    """Stride/reservoir sampling would need the whole input, so iterators refuse it."""
+    with pytest.raises(ValueError):
+        list(iter_minemize(iter([{"a": 1}]), schema_sample=1, schema_sample_mode="reservoir"))
+
+
+def test_minemize_to_text_and_binary():
+    """Text and binary streams receive exactly the minemize() output."""
+    data = [{"id": i, "name": f"naïve {i}", "tags": ["a", "b"]} for i in range(120)]
+    expected = minemize(data)
+
+    text = io.StringIO()
+    minemize_to(data, text, flush_size=64)
+    assert text.getvalue() == expected
+
+    binary = io.BytesIO()
+    minemize_to(iter(data), binary, flush_size=1)
+    assert binary.getvalue() == expected.encode("utf-8")
+
+
+def test_minemize_to_socket_like():
+    """Objects with sendall() (sockets) receive encoded chunks."""
+
+    class FakeSocket:
+        def __init__(self):
+            self.chunks = []
+
+        def sendall(self, payload):
+            self.chunks.append(payload)
+
+    sock = FakeSocket()
+    data = [{"a": 1, "b": True}, {"a": 2, "b": None}]
+    minemize_to(data, sock, preset=presets.compact)
+    assert b"".join(sock.chunks) == minemize(data, preset=presets.compact).encode()